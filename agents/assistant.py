@@ -3,11 +3,11 @@ from typing import Optional
 import os
 
 from agno.agent import Agent
-from agno.models.ollama import Ollama
-from agno.storage.agent.postgres import PostgresAgentStorage
-from ollama import AsyncClient as OllamaAsyncClient
 
-from db.session import db_url
+from agents.context import get_user_context
+from db.session import db_engine
+from db.storage import AsyncPostgresStorage
+from models.ollama import PooledOllama
 
 
 def get_assistant(
@@ -16,11 +16,7 @@ def get_assistant(
     session_id: Optional[str] = None,
     debug_mode: bool = True,
 ) -> Agent:
-    additional_context = ""
-    if user_id:
-        additional_context += "<context>"
-        additional_context += f"You are interacting with the user: {user_id}"
-        additional_context += "</context>"
+    additional_context = get_user_context(user_id)
 
     # Get Ollama API key from environment
     api_key = os.getenv("OLLAMA_TURBO_API_KEY")
@@ -32,18 +28,16 @@ def get_assistant(
         agent_id="assistant",
         user_id=user_id,
         session_id=session_id,
-        model=Ollama(
+        model=PooledOllama(
             id="gpt-oss:120b",
-            async_client=OllamaAsyncClient(
-                host="https://ollama.com",
-                headers={'Authorization': f'Bearer {api_key}'}
-            ),
+            host="https://ollama.com",
+            api_key=api_key,
             timeout=900,
         ),
         # No tools for this simple agent
         tools=[],
         # Storage for the agent
-        storage=PostgresAgentStorage(table_name="assistant_sessions", db_url=db_url),
+        storage=AsyncPostgresStorage(table_name="assistant_sessions", db_engine=db_engine),
         # Description of the agent
         description=dedent("""\
             You are Assistant, a helpful AI that provides clear, accurate, and thoughtful responses.
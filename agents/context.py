@@ -0,0 +1,11 @@
+from typing import Optional
+
+
+def get_user_context(user_id: Optional[str] = None) -> str:
+    """Returns the additional context that tells an Agent which user it is talking to."""
+    additional_context = ""
+    if user_id:
+        additional_context += "<context>"
+        additional_context += f"You are interacting with the user: {user_id}"
+        additional_context += "</context>"
+    return additional_context
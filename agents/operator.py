@@ -1,10 +1,6 @@
 from enum import Enum
 from typing import List, Optional
 
-from agents.sage import get_sage
-from agents.scholar import get_scholar
-from agents.assistant import get_assistant
-
 
 class AgentType(Enum):
     SAGE = "sage"  # Kimi-k2 Free with tools
@@ -24,12 +20,19 @@ def get_agent(
     session_id: Optional[str] = None,
     debug_mode: bool = True,
 ):
+    # Agent modules are imported on first use to keep Api startup fast
     if agent_id == AgentType.SAGE:
+        from agents.sage import get_sage
+
         # Sage uses Kimi-k2 Free with tools
         return get_sage(model_id=model_id, user_id=user_id, session_id=session_id, debug_mode=debug_mode)
     elif agent_id == AgentType.ASSISTANT:
+        from agents.assistant import get_assistant
+
         # Assistant uses GPT-OSS:120B without tools
         return get_assistant(model_id=model_id, user_id=user_id, session_id=session_id, debug_mode=debug_mode)
     else:
+        from agents.scholar import get_scholar
+
         # Default to Scholar (Kimi-k2 Free with tools)
         return get_scholar(model_id=model_id, user_id=user_id, session_id=session_id, debug_mode=debug_mode)
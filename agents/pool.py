@@ -0,0 +1,112 @@
+from copy import copy
+from dataclasses import fields
+from inspect import signature
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from agno.agent import Agent
+
+from agents.context import get_user_context
+from agents.operator import AgentType, get_agent
+
+# Agent fields that hold clients and engines but no per-run state.
+# These are shared by reference between the pooled prototype and every request-bound copy.
+SHARED_AGENT_FIELDS = ("model", "storage", "knowledge")
+
+# Agent fields that are deep-copied like Agent.deep_copy does. Agent.run points every tool
+# function at the running Agent (function._agent), so sharing tools would let concurrent
+# requests run tool calls with each other's Agent, session and user.
+DEEP_COPIED_AGENT_FIELDS = ("tools",)
+
+# Agent fields that hold per-session state and must start empty on every request-bound copy.
+PER_REQUEST_AGENT_FIELDS = ("memory", "user_id", "session_id", "session_name", "additional_context")
+
+
+def bind_agent(
+    prototype: Agent,
+    user_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+    with_user_context: bool = True,
+) -> Agent:
+    """
+    Create a request-bound Agent from a prototype.
+
+    Heavy, stateless parts (model client, storage engine, knowledge base) are shared with the prototype.
+    Tools are deep-copied and everything else is copied, so concurrent requests never mutate each other's Agent.
+
+    Args:
+        prototype: The warm Agent to copy from
+        user_id: The user to bind the new Agent to
+        session_id: The session to bind the new Agent to
+        with_user_context: Set additional_context to the user context, otherwise keep the prototype's
+
+    Returns:
+        Agent: A new Agent bound to user_id and session_id
+    """
+    init_params = signature(prototype.__class__.__init__).parameters
+    agent_fields: Dict[str, Any] = {}
+    for f in fields(prototype):
+        if f.name in PER_REQUEST_AGENT_FIELDS or f.name not in init_params:
+            continue
+        value = getattr(prototype, f.name)
+        if value is None:
+            continue
+        if f.name in SHARED_AGENT_FIELDS:
+            agent_fields[f.name] = value
+        elif f.name in DEEP_COPIED_AGENT_FIELDS:
+            agent_fields[f.name] = prototype._deep_copy_field(f.name, value)
+        elif isinstance(value, (list, dict, set)):
+            agent_fields[f.name] = copy(value)
+        else:
+            agent_fields[f.name] = value
+
+    return prototype.__class__(
+        **agent_fields,
+        user_id=user_id,
+        session_id=session_id,
+        additional_context=get_user_context(user_id) if with_user_context else prototype.additional_context,
+    )
+
+
+class AgentPool:
+    """Keeps one warm prototype Agent per (agent_id, model_id) and hands out request-bound copies of it."""
+
+    def __init__(self, debug_mode: bool = True):
+        self.debug_mode = debug_mode
+        self._prototypes: Dict[Tuple[AgentType, str], Agent] = {}
+        self._lock = Lock()
+
+    def get_prototype(self, agent_id: AgentType, model_id: str) -> Agent:
+        """Returns the prototype Agent for (agent_id, model_id), building it on first use."""
+        key = (agent_id, model_id)
+        prototype = self._prototypes.get(key)
+        if prototype is None:
+            with self._lock:
+                prototype = self._prototypes.get(key)
+                if prototype is None:
+                    prototype = get_agent(model_id=model_id, agent_id=agent_id, debug_mode=self.debug_mode)
+                    self._prototypes[key] = prototype
+        return prototype
+
+    def get_agent(
+        self,
+        model_id: str,
+        agent_id: AgentType,
+        user_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+    ) -> Agent:
+        """Returns an Agent bound to user_id and session_id, built from the pooled prototype."""
+        return bind_agent(self.get_prototype(agent_id, model_id), user_id=user_id, session_id=session_id)
+
+    def keys(self) -> List[Tuple[AgentType, str]]:
+        """Returns the (agent_id, model_id) pairs that currently have a warm prototype."""
+        return list(self._prototypes.keys())
+
+    def clear(self) -> None:
+        """Drop all prototypes, so the next request rebuilds them."""
+        with self._lock:
+            self._prototypes.clear()
+
+
+# Create the process-wide AgentPool
+agent_pool = AgentPool()
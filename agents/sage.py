@@ -2,13 +2,16 @@ from textwrap import dedent
 from typing import Optional
 
 from agno.agent import Agent, AgentKnowledge
-from agno.models.openrouter import OpenRouter
-from agno.storage.agent.postgres import PostgresAgentStorage
 from agno.tools.duckduckgo import DuckDuckGoTools
-from agno.vectordb.pgvector import PgVector, SearchType
+from agno.vectordb.pgvector import SearchType
 
+from agents.context import get_user_context
 from agents.settings import agent_settings
-from db.session import db_url
+from db.session import db_engine
+from db.storage import AsyncPostgresStorage
+from knowledge.embeddings import CachedOpenAIEmbedder
+from knowledge.vector_index import TunedPgVector
+from models.openrouter import PooledOpenRouter
 
 
 def get_sage(
@@ -17,11 +20,7 @@ def get_sage(
     session_id: Optional[str] = None,
     debug_mode: bool = True,
 ) -> Agent:
-    additional_context = ""
-    if user_id:
-        additional_context += "<context>"
-        additional_context += f"You are interacting with the user: {user_id}"
-        additional_context += "</context>"
+    additional_context = get_user_context(user_id)
 
     # Use Kimi-k2 Free as the default model, or the specified model
     model_id = model_id or "moonshotai/kimi-k2:free"
@@ -30,16 +29,21 @@ def get_sage(
         agent_id="sage",
         user_id=user_id,
         session_id=session_id,
-        model=OpenRouter(
+        model=PooledOpenRouter(
             id=model_id,
         ),
         # Tools available to the agent
         tools=[DuckDuckGoTools()],
         # Storage for the agent
-        storage=PostgresAgentStorage(table_name="sage_sessions", db_url=db_url),
+        storage=AsyncPostgresStorage(table_name="sage_sessions", db_engine=db_engine),
         # Knowledge base for the agent
         knowledge=AgentKnowledge(
-            vector_db=PgVector(table_name="sage_knowledge", db_url=db_url, search_type=SearchType.hybrid)
+            vector_db=TunedPgVector(
+                table_name="sage_knowledge",
+                db_engine=db_engine,
+                search_type=SearchType.hybrid,
+                embedder=CachedOpenAIEmbedder(id=agent_settings.embedding_model),
+            )
         ),
         # Description of the agent
         description=dedent("""\
@@ -2,12 +2,13 @@ from textwrap import dedent
 from typing import Optional
 
 from agno.agent import Agent
-from agno.models.openrouter import OpenRouter
-from agno.storage.agent.postgres import PostgresAgentStorage
 from agno.tools.duckduckgo import DuckDuckGoTools
 
+from agents.context import get_user_context
 from agents.settings import agent_settings
-from db.session import db_url
+from db.session import db_engine
+from db.storage import AsyncPostgresStorage
+from models.openrouter import PooledOpenRouter
 
 
 def get_scholar(
@@ -16,11 +17,7 @@ def get_scholar(
     session_id: Optional[str] = None,
     debug_mode: bool = True,
 ) -> Agent:
-    additional_context = ""
-    if user_id:
-        additional_context += "<context>"
-        additional_context += f"You are interacting with the user: {user_id}"
-        additional_context += "</context>"
+    additional_context = get_user_context(user_id)
 
     # Use Kimi-k2 Free as the default model, or the specified model
     model_id = model_id or "moonshotai/kimi-k2:free"
@@ -29,13 +26,13 @@ def get_scholar(
         agent_id="scholar",
         user_id=user_id,
         session_id=session_id,
-        model=OpenRouter(
+        model=PooledOpenRouter(
             id=model_id,
         ),
         # Tools available to the agent
         tools=[DuckDuckGoTools()],
         # Storage for the agent
-        storage=PostgresAgentStorage(table_name="scholar_sessions", db_url=db_url),
+        storage=AsyncPostgresStorage(table_name="scholar_sessions", db_engine=db_engine),
         # Description of the agent
         description=dedent("""\
             You are Scholar, a cutting-edge Answer Engine built to deliver precise, context-rich, and engaging responses.
@@ -1,11 +1,26 @@
 # Apply agno-ck metadata fix before any agno imports
 import agno_metadata_fix
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
+from api.routes.playground import playground_app
 from api.routes.v1_router import v1_router
 from api.settings import api_settings
+from db.session import db_async_engine
+from models.http import aclose_http_clients
+from models.ollama import aclose_ollama_clients
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release process-wide resources when the Api shuts down"""
+    yield
+    await db_async_engine.dispose()
+    await aclose_http_clients()
+    await aclose_ollama_clients()
 
 
 def create_app() -> FastAPI:
@@ -18,11 +33,16 @@ def create_app() -> FastAPI:
         docs_url="/docs" if api_settings.docs_enabled else None,
         redoc_url="/redoc" if api_settings.docs_enabled else None,
         openapi_url="/openapi.json" if api_settings.docs_enabled else None,
+        lifespan=lifespan,
     )
 
     # Add v1 router
     app.include_router(v1_router)
 
+    # Mount the Playground on its own prefix, so other /v1 requests never reach it.
+    # It is built on its first request.
+    app.mount(f"/v1{playground_app.prefix}", playground_app)
+
     # Add Middlewares
     app.add_middleware(
         CORSMiddleware,
@@ -0,0 +1,185 @@
+import asyncio
+import hashlib
+import re
+import time
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from agno.agent import Agent
+from agno.team import Team
+from fastapi.responses import JSONResponse, Response
+
+from api.settings import api_settings
+from api.sse import format_sse, sse_response
+from db.cache import MemoryCache, PgCache, normalize_message
+
+if TYPE_CHECKING:
+    from db.semantic_cache import SemanticCache
+
+######################################################
+## Response cache for Agent and Team runs
+######################################################
+
+# Headers of runs that missed the cache, hits also report their Age in seconds
+CACHE_MISS_HEADERS = {"X-Cache": "MISS"}
+
+# Words sent per content event when a cached answer is replayed as a stream
+REPLAY_WORDS_PER_EVENT = 8
+
+
+def create_response_cache() -> Union[MemoryCache, PgCache]:
+    if api_settings.response_cache_backend == "postgres":
+        return PgCache(
+            "responses", ttl=api_settings.response_cache_ttl, max_entries=api_settings.response_cache_max_entries
+        )
+    return MemoryCache(
+        "responses", ttl=api_settings.response_cache_ttl, max_entries=api_settings.response_cache_max_entries
+    )
+
+
+response_cache = create_response_cache()
+
+_semantic_cache: Optional["SemanticCache"] = None
+_semantic_cache_lock = Lock()
+
+
+def get_semantic_cache() -> "SemanticCache":
+    """
+    Returns the cache of answers to similar messages, for the agents in api_settings.semantic_cache_thresholds.
+
+    It is built on first use, so pgvector and the embedder are not loaded before the Api serves requests.
+    """
+    global _semantic_cache
+    if _semantic_cache is None:
+        with _semantic_cache_lock:
+            if _semantic_cache is None:
+                from db.semantic_cache import SemanticCache
+
+                _semantic_cache = SemanticCache("semantic_cache", ttl=api_settings.semantic_cache_ttl)
+    return _semantic_cache
+
+
+def get_response_cache_key(
+    kind: str, runner_id: str, model_id: str, message: str, knowledge_version: Optional[str] = None
+) -> str:
+    """
+    Returns the cache key of a run.
+
+    Messages are normalized, so "What is  RAG?" and "what is rag?" share an answer.
+    Pass the version of the knowledge base the runner searches, to stop serving answers from before an update.
+    """
+    digest = hashlib.sha256(normalize_message(message).encode()).hexdigest()
+    return ":".join([kind, runner_id, model_id, knowledge_version or "", digest])
+
+
+def get_semantic_scope(runner_id: str, model_id: str, knowledge_version: Optional[str] = None) -> str:
+    return ":".join(["agent", runner_id, model_id, knowledge_version or ""])
+
+
+async def get_cached_response(key: str) -> Optional[Dict[str, Any]]:
+    # PgCache blocks on the database, keep it off the event loop
+    return await asyncio.to_thread(response_cache.get, key)
+
+
+async def set_cached_response(key: str, content: str) -> None:
+    await asyncio.to_thread(response_cache.set, key, {"content": content, "created_at": time.time()})
+
+
+@dataclass
+class CacheLookup:
+    """A run that missed the cache, `store` caches its answer."""
+
+    key: str
+    message: str
+    semantic_scope: Optional[str] = None
+    embedding: Optional[List[float]] = None
+    started_at: float = field(default_factory=time.perf_counter)
+
+    async def store(self, content: Any) -> None:
+        if not isinstance(content, str) or not content:
+            return
+        await set_cached_response(self.key, content)
+        if self.semantic_scope is not None and self.embedding is not None:
+            run_seconds = time.perf_counter() - self.started_at
+            await asyncio.to_thread(
+                get_semantic_cache().set, self.semantic_scope, self.message, self.embedding, content, run_seconds
+            )
+
+
+async def lookup_response(
+    kind: str,
+    runner_id: str,
+    model_id: str,
+    message: str,
+    stream: bool,
+    knowledge_version: Optional[str] = None,
+) -> Tuple[Optional[Response], CacheLookup]:
+    """
+    Look up the answer to a run, first by its normalized message and then, for agents with a
+    semantic cache threshold, by the similarity of its message.
+
+    Returns:
+        Tuple[Optional[Response], CacheLookup]: The cached response, or None on a miss,
+            and the lookup whose `store` caches the answer of the run.
+    """
+    lookup = CacheLookup(
+        key=get_response_cache_key(kind, runner_id, model_id, message, knowledge_version=knowledge_version),
+        message=message,
+    )
+    cached = await get_cached_response(lookup.key)
+    if cached is not None:
+        return cached_response(cached, stream=stream), lookup
+
+    threshold = api_settings.semantic_cache_thresholds.get(runner_id) if kind == "agent" else None
+    if threshold is not None:
+        lookup.semantic_scope = get_semantic_scope(runner_id, model_id, knowledge_version=knowledge_version)
+        cached, lookup.embedding = await asyncio.to_thread(
+            get_semantic_cache().get, lookup.semantic_scope, message, threshold=threshold
+        )
+        if cached is not None:
+            return cached_response(cached, stream=stream), lookup
+    return None, lookup
+
+
+async def invalidate_agent_responses(agent_id: str) -> int:
+    """
+    Remove every cached answer of an agent, e.g. after its knowledge changed.
+
+    Returns:
+        int: The number of semantic cache entries removed.
+    """
+    # Exact and semantic cache keys of agents both start with "agent:{agent_id}:"
+    prefix = f"agent:{agent_id}:"
+    await asyncio.to_thread(response_cache.delete_prefix, prefix)
+    return await asyncio.to_thread(get_semantic_cache().invalidate, prefix)
+
+
+async def replay_events(cached: Dict[str, Any]) -> AsyncIterator[str]:
+    """Replay a cached answer as Server-Sent Events, in the format of a live run."""
+    words = re.findall(r"\S+\s*|\s+", cached["content"])
+    for i in range(0, len(words), REPLAY_WORDS_PER_EVENT):
+        yield format_sse({"content": "".join(words[i : i + REPLAY_WORDS_PER_EVENT])}, event="content")
+    yield format_sse({"metrics": {}, "cached": True}, event="metrics")
+
+
+def cached_response(cached: Dict[str, Any], stream: bool) -> Response:
+    """Returns a cached answer as the run endpoints would return it."""
+    headers = {"X-Cache": "HIT", "Age": str(max(0, int(time.time() - cached["created_at"])))}
+    if "similarity" in cached:
+        headers["X-Cache-Similarity"] = str(cached["similarity"])
+    if stream:
+        return sse_response(replay_events(cached), headers=headers)
+    return JSONResponse(cached["content"], headers=headers)
+
+
+async def cache_run_events(
+    events: AsyncIterator[str], runner: Union[Agent, Team], lookup: CacheLookup
+) -> AsyncIterator[str]:
+    """Pass a run's Server-Sent Events through and cache its answer once the run completed without errors."""
+    failed = False
+    async for event in events:
+        failed = failed or event.startswith("event: error")
+        yield event
+    if not failed and runner.run_response is not None:
+        await lookup.store(runner.run_response.content)
@@ -1,12 +1,23 @@
 from enum import Enum
 from typing import AsyncGenerator, List, Optional
+from uuid import uuid4
 
 from agno.agent import Agent
 from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
-
-from agents.operator import AgentType, get_agent, get_available_agents
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+
+from agents.operator import AgentType, get_available_agents
+from agents.pool import agent_pool
+from api.response_cache import (
+    CACHE_MISS_HEADERS,
+    CacheLookup,
+    cache_run_events,
+    invalidate_agent_responses,
+    lookup_response,
+)
+from api.sse import sse_response, stream_run_events
+from db.storage import async_storage_io
 from utils.log import logger
 
 ######################################################
@@ -32,23 +43,29 @@ async def list_agents():
     return get_available_agents()
 
 
-async def chat_response_streamer(agent: Agent, message: str) -> AsyncGenerator:
+async def chat_response_streamer(
+    agent: Agent, message: str, ef_search: Optional[int] = None, probes: Optional[int] = None
+) -> AsyncGenerator:
     """
-    Stream agent responses chunk by chunk.
+    Stream agent run events chunk by chunk.
 
     Args:
         agent: The agent instance to interact with
         message: User message to process
+        ef_search: HNSW ef_search for knowledge searches during the run
+        probes: IVFFlat probes for knowledge searches during the run
 
     Yields:
-        Text chunks from the agent response
+        Server-Sent Events for content deltas, tool calls, metrics and run completion
     """
-    run_response = await agent.arun(message, stream=True)
-    async for chunk in run_response:
-        # chunk.content only contains the text response from the Agent.
-        # For advanced use cases, we should yield the entire chunk
-        # that contains the tool calls and intermediate steps.
-        yield chunk.content
+    # Imported on first run, with the agents that search a knowledge base, rather than before /health
+    from knowledge.vector_index import search_params
+
+    # The generator runs after the route returns, so the search parameters are set here
+    with search_params(ef_search=ef_search, probes=probes):
+        async with async_storage_io(agent.storage, session_id=agent.session_id):
+            async for event in stream_run_events(agent, message):
+                yield event
 
 
 class RunRequest(BaseModel):
@@ -59,6 +76,13 @@ class RunRequest(BaseModel):
     model: Model = Model.gpt_4o
     user_id: Optional[str] = None
     session_id: Optional[str] = None
+    # Answer from the response cache when the same message was answered before.
+    # Cached answers are shared between users and are not used for messages in an existing session.
+    cache: bool = False
+    knowledge_version: Optional[str] = None
+    # Trade knowledge search recall for latency: candidates of the HNSW index or lists of the IVFFlat index searched
+    ef_search: Optional[int] = Field(None, ge=1, le=1000)
+    probes: Optional[int] = Field(None, ge=1, le=10000)
 
 
 @agents_router.post("/{agent_id}/runs", status_code=status.HTTP_200_OK)
@@ -75,24 +99,61 @@ async def run_agent(agent_id: AgentType, body: RunRequest):
     """
     logger.debug(f"RunRequest: {body}")
 
+    cache_lookup: Optional[CacheLookup] = None
+    if body.cache and body.session_id is None:
+        cached, cache_lookup = await lookup_response(
+            "agent",
+            agent_id.value,
+            body.model.value,
+            body.message,
+            stream=body.stream,
+            knowledge_version=body.knowledge_version,
+        )
+        if cached is not None:
+            return cached
+
     try:
-        agent: Agent = get_agent(
+        # Bind the request to a pooled Agent, so the model client, storage and knowledge are reused
+        agent: Agent = agent_pool.get_agent(
             model_id=body.model.value,
             agent_id=agent_id,
             user_id=body.user_id,
-            session_id=body.session_id,
+            # Resolve the session up front, so its storage can be prefetched with the async engine
+            session_id=body.session_id or str(uuid4()),
         )
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Agent not found: {str(e)}")
 
     if body.stream:
-        return StreamingResponse(
-            chat_response_streamer(agent, body.message),
-            media_type="text/event-stream",
-        )
+        streamer = chat_response_streamer(agent, body.message, ef_search=body.ef_search, probes=body.probes)
+        if cache_lookup is None:
+            return sse_response(streamer)
+        events = cache_run_events(streamer, agent, cache_lookup)
+        return sse_response(events, headers=CACHE_MISS_HEADERS)
     else:
-        response = await agent.arun(body.message, stream=False)
-        # response.content only contains the text response from the Agent.
-        # For advanced use cases, we should yield the entire response
-        # that contains the tool calls and intermediate steps.
-        return response.content
+        from knowledge.vector_index import search_params
+
+        with search_params(ef_search=body.ef_search, probes=body.probes):
+            async with async_storage_io(agent.storage, session_id=agent.session_id):
+                response = await agent.arun(body.message, stream=False)
+        if cache_lookup is None:
+            # response.content only contains the text response from the Agent.
+            # For advanced use cases, we should yield the entire response
+            # that contains the tool calls and intermediate steps.
+            return response.content
+        await cache_lookup.store(response.content)
+        return JSONResponse(response.content, headers=CACHE_MISS_HEADERS)
+
+
+@agents_router.delete("/{agent_id}/cache", status_code=status.HTTP_200_OK)
+async def invalidate_agent_cache(agent_id: AgentType):
+    """
+    Removes the cached answers of an agent from the response and semantic caches.
+
+    Args:
+        agent_id: The ID of the agent
+
+    Returns:
+        The number of semantic cache entries removed
+    """
+    return {"semantic_entries_removed": await invalidate_agent_responses(agent_id.value)}
@@ -1,40 +1,92 @@
+import asyncio
 from os import getenv
+from typing import Optional
 
 from agno.playground import Playground
+from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from agents.sage import get_sage
-from agents.scholar import get_scholar
-from teams.finance_researcher import get_finance_researcher_team
-from teams.multi_language import get_multi_language_team
-from workflows.blog_post_generator import get_blog_post_generator
-from workflows.investment_report_generator import get_investment_report_generator
+from utils.log import logger
 from workspace.dev_resources import dev_fastapi
 
 ######################################################
 ## Router for the Playground Interface
 ######################################################
 
-sage_agent = get_sage(debug_mode=True)
-scholar_agent = get_scholar(debug_mode=True)
-finance_researcher_team = get_finance_researcher_team(debug_mode=True)
-multi_language_team = get_multi_language_team(debug_mode=True)
-blog_post_workflow = get_blog_post_generator(debug_mode=True)
-investment_report_workflow = get_investment_report_generator(debug_mode=True)
 
-# Create a playground instance
-playground = Playground(
-    agents=[sage_agent, scholar_agent], 
-    teams=[finance_researcher_team, multi_language_team],
-    workflows=[blog_post_workflow, investment_report_workflow]
-)
+def get_playground() -> Playground:
+    """Build the Playground with all agents, teams and workflows"""
+
+    # Imported here so yfinance, newspaper4k, duckduckgo and pgvector are only loaded
+    # when the Playground is first used, not when the Api starts.
+    from agents.sage import get_sage
+    from agents.scholar import get_scholar
+    from teams.finance_researcher import get_finance_researcher_team
+    from teams.multi_language import get_multi_language_team
+    from workflows.blog_post_generator import get_blog_post_generator
+    from workflows.investment_report_generator import get_investment_report_generator
+
+    sage_agent = get_sage(debug_mode=True)
+    scholar_agent = get_scholar(debug_mode=True)
+    finance_researcher_team = get_finance_researcher_team(debug_mode=True)
+    multi_language_team = get_multi_language_team(debug_mode=True)
+    blog_post_workflow = get_blog_post_generator(debug_mode=True)
+    investment_report_workflow = get_investment_report_generator(debug_mode=True)
+
+    # Create a playground instance
+    return Playground(
+        agents=[sage_agent, scholar_agent],
+        teams=[finance_researcher_team, multi_language_team],
+        workflows=[blog_post_workflow, investment_report_workflow],
+    )
+
+
+class LazyPlaygroundApp:
+    """
+    ASGI app that builds the Playground the first time a /playground route is requested.
+
+    Building the Playground creates every agent, team and workflow. Deferring it keeps
+    Api startup, and the first /v1/health response, independent of that cost.
+    """
+
+    prefix = "/playground"
+
+    def __init__(self) -> None:
+        self._app: Optional[ASGIApp] = None
+        self._lock = asyncio.Lock()
+
+    async def get_app(self) -> ASGIApp:
+        if self._app is None:
+            async with self._lock:
+                if self._app is None:
+                    logger.info("Building the Playground on first use")
+                    playground = await run_in_threadpool(get_playground)
+                    app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
+                    app.include_router(playground.get_async_router())
+                    self._app = app
+        return self._app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            return
+
+        # Mounted at {prefix}, but the Playground's routes include the prefix themselves
+        root_path = scope.get("root_path", "")
+        if root_path.endswith(self.prefix):
+            scope = {**scope, "root_path": root_path[: -len(self.prefix)]}
+
+        app = await self.get_app()
+        await app(scope, receive, send)
+
 
 # Register the endpoint with Agno Playground
 # This allows the hosted playground at http://app.agno.com/playground to connect
-# Note: We use get_async_router() instead of serve() since we're integrating with FastAPI
+# Note: We mount a lazily built app instead of calling serve() since we're integrating with FastAPI
 if getenv("RUNTIME_ENV") == "dev":
     # For local development, the playground will be accessible at http://localhost:8000
     # Connect from http://app.agno.com/playground using this URL
     playground_endpoint = f"http://localhost:{dev_fastapi.port_number}"
     # Note: playground.serve() would start its own server, so we use the router instead
-    
-playground_router = playground.get_async_router()
+
+playground_app = LazyPlaygroundApp()
@@ -1,5 +1,10 @@
 from fastapi import APIRouter
 
+from db.cache import get_cache_metrics
+from db.session import db_async_engine, get_db_pool_metrics
+from models.http import get_http_pool_metrics
+from models.ollama import get_ollama_client_count
+from teams.operator import team_run_latency
 from utils.dttm import current_utc_str
 
 ######################################################
@@ -19,3 +24,23 @@ def get_health():
         "path": "/health",
         "utc": current_utc_str(),
     }
+
+
+@status_router.get("/metrics")
+def get_metrics():
+    """Return runtime metrics for the shared resources of this Api process"""
+    # Imported here, they load pgvector and the embedder which /health does not need
+    from api.response_cache import get_semantic_cache
+    from knowledge.embeddings import get_embedding_cache_metrics
+
+    return {
+        "utc": current_utc_str(),
+        "db_pool": get_db_pool_metrics(),
+        "db_async_pool": get_db_pool_metrics(db_async_engine.sync_engine),
+        "caches": get_cache_metrics(),
+        "semantic_cache": get_semantic_cache().get_metrics(),
+        "embedding_cache": get_embedding_cache_metrics(),
+        "http_pool": get_http_pool_metrics(),
+        "ollama_clients": get_ollama_client_count(),
+        "team_run_latency": team_run_latency.get_metrics(),
+    }
@@ -1,12 +1,27 @@
+import time
 from enum import Enum
-from typing import AsyncGenerator, List, Optional
+from typing import AsyncGenerator, List, Optional, Union
+from uuid import uuid4
 
+from agno.agent import Agent
 from agno.team import Team
 from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from teams.operator import TeamType, get_available_teams, get_team
-
+from teams.operator import (
+    TeamMode,
+    TeamType,
+    add_team_history,
+    get_available_teams,
+    get_team,
+    pre_route,
+    record_pre_routed_run,
+    team_run_latency,
+)
+
+from api.response_cache import CACHE_MISS_HEADERS, CacheLookup, cache_run_events, lookup_response
+from api.sse import sse_response, stream_run_events
+from db.storage import async_storage_io
 from utils.log import logger
 
 ######################################################
@@ -31,21 +46,35 @@ async def list_teams():
     return get_available_teams()
 
 
-async def chat_response_streamer(team: Team, message: str) -> AsyncGenerator:
+async def chat_response_streamer(
+    team: Team, message: str, runner: Optional[Union[Agent, Team]] = None, latency_key: Optional[str] = None
+) -> AsyncGenerator:
     """
-    Stream team responses chunk by chunk.
+    Stream team run events chunk by chunk.
     Args:
         team: The team instance to interact with
         message: User message to process
+        runner: The member agent the message was pre-routed to, the team itself if None
+        latency_key: Records the time to first content and the total run time under this key
     Yields:
-        Text chunks from the team response
+        Server-Sent Events for content deltas, tool calls, metrics and run completion
     """
-    run_response = await team.arun(message, stream=True)
-    async for chunk in run_response:
-        # chunk.content only contains the text response from the Agent.
-        # For advanced use cases, we should yield the entire chunk
-        # that contains the tool calls and intermediate steps.
-        yield chunk.content
+    runner = runner or team
+    start = time.perf_counter()
+    first_content = False
+    # A pre-routed member runs in the team's session, which holds its history and records its answer
+    async with async_storage_io(team.storage, session_id=team.session_id):
+        if isinstance(runner, Agent):
+            add_team_history(team, runner)
+        async for event in stream_run_events(runner, message):
+            if latency_key and not first_content and event.startswith("event: content"):
+                first_content = True
+                team_run_latency.record(f"{latency_key}:first_content", time.perf_counter() - start)
+            yield event
+        if isinstance(runner, Agent):
+            record_pre_routed_run(team, runner, message)
+    if latency_key:
+        team_run_latency.record(latency_key, time.perf_counter() - start)
 
 
 class RunRequest(BaseModel):
@@ -56,6 +85,11 @@ class RunRequest(BaseModel):
     model: Model = Model.gpt_4o
     user_id: Optional[str] = None
     session_id: Optional[str] = None
+    mode: TeamMode = TeamMode.ROUTE
+    # Answer from the response cache when the same message was answered before.
+    # Cached answers are shared between users and are not used for messages in an existing session.
+    cache: bool = False
+    knowledge_version: Optional[str] = None
 
 
 @teams_router.post("/{team_id}/runs", status_code=status.HTTP_200_OK)
@@ -70,24 +104,61 @@ async def run_team(team_id: TeamType, body: RunRequest):
     """
     logger.debug(f"RunRequest: {body}")
 
+    if body.mode == TeamMode.COLLABORATE and team_id != TeamType.FINANCE_RESEARCHER:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Team {team_id.value} does not support mode collaborate"
+        )
+
+    cache_lookup: Optional[CacheLookup] = None
+    if body.cache and body.session_id is None:
+        cached, cache_lookup = await lookup_response(
+            "team",
+            f"{team_id.value}:{body.mode.value}",
+            body.model.value,
+            body.message,
+            stream=body.stream,
+            knowledge_version=body.knowledge_version,
+        )
+        if cached is not None:
+            return cached
+
     try:
         team: Team = get_team(
             model_id=body.model.value,
             team_id=team_id,
             user_id=body.user_id,
-            session_id=body.session_id,
+            # Resolve the session up front, so its storage can be prefetched with the async engine
+            session_id=body.session_id or str(uuid4()),
+            mode=body.mode,
         )
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Team not found: {str(e)}")
 
+    # Messages the team can route without its leader go straight to the member agent
+    runner: Union[Agent, Team] = pre_route(team_id, team, body.message)
+    latency_key = f"{team_id.value}:{body.mode.value}"
+    if runner is not team:
+        logger.debug(f"Pre-routed to {runner.name}")
+        latency_key = f"{latency_key}:pre_routed"
+
     if body.stream:
-        return StreamingResponse(
-            chat_response_streamer(team, body.message),
-            media_type="text/event-stream",
-        )
+        events = chat_response_streamer(team, body.message, runner=runner, latency_key=latency_key)
+        if cache_lookup is None:
+            return sse_response(events)
+        return sse_response(cache_run_events(events, runner, cache_lookup), headers=CACHE_MISS_HEADERS)
     else:
-        response = await team.arun(body.message, stream=False)
-        # response.content only contains the text response from the Agent.
-        # For advanced use cases, we should yield the entire response
-        # that contains the tool calls and intermediate steps.
-        return response.content
+        start = time.perf_counter()
+        async with async_storage_io(team.storage, session_id=team.session_id):
+            if isinstance(runner, Agent):
+                add_team_history(team, runner)
+            response = await runner.arun(body.message, stream=False)
+            if isinstance(runner, Agent):
+                record_pre_routed_run(team, runner, body.message)
+        team_run_latency.record(latency_key, time.perf_counter() - start)
+        if cache_lookup is None:
+            # response.content only contains the text response from the Agent.
+            # For advanced use cases, we should yield the entire response
+            # that contains the tool calls and intermediate steps.
+            return response.content
+        await cache_lookup.store(response.content)
+        return JSONResponse(response.content, headers=CACHE_MISS_HEADERS)
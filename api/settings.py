@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import Field, field_validator
 from pydantic_core.core_schema import FieldValidationInfo
@@ -22,6 +22,19 @@ class ApiSettings(BaseSettings):
     # Set to False to disable docs at /docs and /redoc
     docs_enabled: bool = True
 
+    # Seconds without a streamed event before a Server-Sent Events heartbeat is sent
+    sse_heartbeat_interval: float = 15.0
+
+    # Response cache for runs that opt in with `cache: true`.
+    # "memory" caches per Api process, "postgres" shares the cache between processes.
+    response_cache_backend: Literal["memory", "postgres"] = "memory"
+    response_cache_ttl: int = 60 * 60
+    response_cache_max_entries: int = 1000
+    # Agents that also answer from the semantic cache, with the cosine similarity a cached message needs.
+    # Agents without a threshold only reuse answers to the same normalized message.
+    semantic_cache_thresholds: Dict[str, float] = {"scholar": 0.95}
+    semantic_cache_ttl: int = 24 * 60 * 60
+
     # Cors origin list to allow requests from.
     # This list is set using the set_cors_origin_list validator
     # which uses the runtime_env variable to set the
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import re
+from typing import Any, AsyncIterator, Dict, Optional, Union
+
+from agno.agent import Agent
+from agno.team import Team
+from fastapi.responses import StreamingResponse
+
+from api.settings import api_settings
+
+######################################################
+## Server-Sent Events for Agent and Team runs
+######################################################
+
+# A comment line keeps idle connections open through load balancers and proxies
+SSE_HEARTBEAT = ": heartbeat\n\n"
+
+# Headers that stop proxies from buffering the stream
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+# Agno run events renamed for API clients. Team events use the same names without the "Team" prefix.
+RUN_EVENT_NAMES = {
+    "RunResponseContent": "content",
+    "ToolCallStarted": "tool_call_started",
+    "ToolCallCompleted": "tool_call_completed",
+    "RunCompleted": "run_completed",
+    "RunError": "error",
+}
+
+
+def format_sse(data: Any, event: Optional[str] = None, id: Optional[str] = None) -> str:
+    """
+    Frame a message as a Server-Sent Event.
+
+    Args:
+        data: The payload, strings are sent as is and everything else is sent as JSON
+        event: The event type
+        id: The event id
+
+    Returns:
+        str: The framed event, terminated by a blank line
+    """
+    payload = data if isinstance(data, str) else json.dumps(data, default=str)
+    lines = []
+    if event is not None:
+        lines.append(f"event: {event}")
+    if id is not None:
+        lines.append(f"id: {id}")
+    lines.extend(f"data: {line}" for line in payload.split("\n"))
+    return "\n".join(lines) + "\n\n"
+
+
+def get_event_name(event: str) -> str:
+    """Returns the client-facing name of an agno run event."""
+    if event.startswith("Team"):
+        event = event[len("Team") :]
+    return RUN_EVENT_NAMES.get(event) or re.sub(r"(?<!^)(?=[A-Z])", "_", event).lower()
+
+
+def encode_run_event(chunk: Any) -> Optional[str]:
+    """Encode a streamed agno run event as a Server-Sent Event, or None if it carries nothing to send."""
+    event_name = get_event_name(getattr(chunk, "event", "") or "RunResponseContent")
+    if event_name == "content":
+        if chunk.content is None:
+            return None
+        return format_sse({"content": chunk.content}, event=event_name)
+    if event_name in ("tool_call_started", "tool_call_completed"):
+        tool = getattr(chunk, "tool", None)
+        return format_sse({"tool": tool.to_dict() if tool is not None else None}, event=event_name)
+    if hasattr(chunk, "to_dict"):
+        return format_sse(chunk.to_dict(), event=event_name)
+    return format_sse({"content": getattr(chunk, "content", None)}, event=event_name)
+
+
+async def with_heartbeat(events: AsyncIterator[str], interval: float) -> AsyncIterator[str]:
+    """Yield from events, sending a heartbeat comment whenever nothing was sent for `interval` seconds."""
+    iterator = events.__aiter__()
+    next_event = asyncio.ensure_future(iterator.__anext__())
+    try:
+        while True:
+            done, _ = await asyncio.wait({next_event}, timeout=interval)
+            if not done:
+                yield SSE_HEARTBEAT
+                continue
+            try:
+                event = next_event.result()
+            except StopAsyncIteration:
+                break
+            yield event
+            next_event = asyncio.ensure_future(iterator.__anext__())
+    finally:
+        next_event.cancel()
+
+
+async def run_events(runner: Union[Agent, Team], message: str) -> AsyncIterator[str]:
+    """Run an Agent or Team and yield every run event, followed by the run metrics, as Server-Sent Events."""
+    try:
+        run_response = await runner.arun(message, stream=True, stream_intermediate_steps=True)
+        async for chunk in run_response:
+            encoded = encode_run_event(chunk)
+            if encoded is not None:
+                yield encoded
+    except Exception as e:
+        yield format_sse({"error": str(e)}, event="error")
+        return
+
+    metrics: Dict[str, Any] = {}
+    if runner.run_response is not None and runner.run_response.metrics:
+        metrics = runner.run_response.metrics
+    yield format_sse({"metrics": metrics}, event="metrics")
+
+
+async def stream_run_events(
+    runner: Union[Agent, Team], message: str, heartbeat_interval: Optional[float] = None
+) -> AsyncIterator[str]:
+    """Stream a run as Server-Sent Events with heartbeats."""
+    interval = heartbeat_interval or api_settings.sse_heartbeat_interval
+    async for event in with_heartbeat(run_events(runner, message), interval):
+        yield event
+
+
+def sse_response(events: AsyncIterator[str], headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+    """Wrap a Server-Sent Events generator in an unbuffered StreamingResponse."""
+    return StreamingResponse(events, media_type="text/event-stream", headers={**SSE_HEADERS, **(headers or {})})
@@ -0,0 +1,65 @@
+"""Benchmark Agent setup throughput: per-request construction vs. the AgentPool.
+
+Measures how many Agents per second the /v1/agents/{agent_id}/runs endpoint can prepare
+before it hands the message to the model. Model latency is excluded on purpose, it is the
+same for both paths.
+
+Usage:
+    python -m benchmarks.agent_pool --requests 500
+"""
+
+# Apply agno-ck metadata fix before any agno imports
+import agno_metadata_fix
+
+import argparse
+import time
+from typing import Callable
+from uuid import uuid4
+
+from agents.operator import AgentType, get_agent
+from agents.pool import AgentPool
+
+MODEL_ID = "moonshotai/kimi-k2:free"
+
+
+def measure(build: Callable[[int], object], num_requests: int) -> float:
+    """Returns the number of Agents per second built by `build`."""
+    start = time.perf_counter()
+    for i in range(num_requests):
+        build(i)
+    return num_requests / (time.perf_counter() - start)
+
+
+def main(num_requests: int) -> None:
+    for agent_type in (AgentType.SCHOLAR, AgentType.SAGE):
+        before = measure(
+            lambda i: get_agent(
+                model_id=MODEL_ID,
+                agent_id=agent_type,
+                user_id=f"user-{i}",
+                session_id=str(uuid4()),
+                debug_mode=False,
+            ),
+            num_requests,
+        )
+        pool = AgentPool(debug_mode=False)
+        after = measure(
+            lambda i: pool.get_agent(
+                model_id=MODEL_ID,
+                agent_id=agent_type,
+                user_id=f"user-{i}",
+                session_id=str(uuid4()),
+            ),
+            num_requests,
+        )
+        print(
+            f"{agent_type.value:<10} per-request: {before:>10.1f} req/s  "
+            f"pooled: {after:>10.1f} req/s  speedup: {after / before:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Number of requests to simulate per agent")
+    args = parser.parse_args()
+    main(args.requests)
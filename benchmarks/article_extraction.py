@@ -0,0 +1,69 @@
+"""Benchmark article extraction in the blog workflow: direct newspaper4k/BeautifulSoup vs. the LLM scraper.
+
+Reports model tokens and seconds per article for both modes. The direct mode never calls
+a model, so its token count is always 0. The LLM mode needs the model credentials of the
+article_scraper Agent.
+
+Usage:
+    python -m benchmarks.article_extraction https://example.com/article-1 https://example.com/article-2
+"""
+
+# Apply agno-ck metadata fix before any agno imports
+import agno_metadata_fix
+
+import argparse
+import statistics
+import time
+from typing import List, Optional, Tuple
+
+from workflows.blog_post_generator import BlogPostGenerator, NewsArticle, extract_article
+
+
+def run_direct(article: NewsArticle) -> Tuple[float, int, bool]:
+    """Returns (seconds, tokens, success) for direct extraction."""
+    start = time.perf_counter()
+    scraped_article = extract_article(article)
+    return time.perf_counter() - start, 0, scraped_article is not None
+
+
+def run_llm(article: NewsArticle) -> Tuple[float, int, bool]:
+    """Returns (seconds, tokens, success) for the article_scraper Agent."""
+    article_scraper = BlogPostGenerator.article_scraper.deep_copy()
+    start = time.perf_counter()
+    response = article_scraper.run(article.url)
+    elapsed = time.perf_counter() - start
+    metrics = (response.metrics if response is not None else None) or {}
+    tokens = sum(metrics.get("total_tokens", []))
+    return elapsed, tokens, response is not None and response.content is not None
+
+
+def report(mode: str, results: List[Tuple[float, int, bool]]) -> Optional[float]:
+    if not results:
+        return None
+    seconds = [r[0] for r in results]
+    tokens = [r[1] for r in results]
+    succeeded = sum(1 for r in results if r[2])
+    print(
+        f"{mode:<8} articles: {len(results):>3}  succeeded: {succeeded:>3}  "
+        f"median: {statistics.median(seconds):>6.2f} s/article  "
+        f"mean: {statistics.mean(tokens):>8.0f} tokens/article"
+    )
+    return statistics.median(seconds)
+
+
+def main(urls: List[str], skip_llm: bool) -> None:
+    articles = [NewsArticle(title=url, url=url, summary=None) for url in urls]
+    direct = report("direct", [run_direct(article) for article in articles])
+    if skip_llm:
+        return
+    llm = report("llm", [run_llm(article) for article in articles])
+    if direct and llm:
+        print(f"direct extraction is {llm / direct:.1f}x faster per article")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("urls", nargs="+", help="Article URLs to extract")
+    parser.add_argument("--skip-llm", action="store_true", help="Only measure direct extraction")
+    args = parser.parse_args()
+    main(args.urls, args.skip_llm)
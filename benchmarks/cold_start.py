@@ -0,0 +1,56 @@
+"""Benchmark Api cold start: time from process launch to the first 200 from /v1/health.
+
+This is the delay an ECS task adds before it can pass health checks and take traffic.
+Run it once on the current tree and once on an older checkout to compare.
+
+Usage:
+    python -m benchmarks.cold_start --runs 5
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+
+def time_to_first_health(port: int, timeout: float) -> float:
+    """Start uvicorn and return the seconds until /v1/health answers 200."""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/v1/health", timeout=1).status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.TransportError:
+                pass
+            time.sleep(0.05)
+        raise TimeoutError(f"/v1/health did not answer within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main(runs: int, port: int, timeout: float) -> None:
+    timings = [time_to_first_health(port, timeout) for _ in range(runs)]
+    for i, t in enumerate(timings, start=1):
+        print(f"run {i}: {t:.2f}s")
+    print(f"median time to first /v1/health 200: {statistics.median(timings):.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="Number of cold starts to measure")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the benchmarked Api")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds to wait for a healthy Api")
+    args = parser.parse_args()
+    main(args.runs, args.port, args.timeout)
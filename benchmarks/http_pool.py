@@ -0,0 +1,106 @@
+"""Benchmark model HTTP calls: a new HTTP client per request (OpenRouter) vs. the shared pool (PooledOpenRouter).
+
+Starts a local OpenAI-compatible stub server that answers chat completions immediately,
+so the difference per call is the cost of setting up a client and a connection. The stub
+speaks plain HTTP, against https://openrouter.ai the TLS handshake saved on every
+reused connection comes on top of this.
+
+Usage:
+    python -m benchmarks.http_pool --calls 200
+"""
+
+# Apply agno-ck metadata fix before any agno imports
+import agno_metadata_fix
+
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+from typing import Any, Dict, List
+
+import uvicorn
+from agno.models.openrouter import OpenRouter
+from fastapi import FastAPI
+
+from models.http import get_http_pool_metrics
+from models.openrouter import PooledOpenRouter
+
+stub = FastAPI()
+
+
+@stub.post("/v1/chat/completions")
+def chat_completions(body: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    }
+
+
+def start_stub(port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(stub, port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+MESSAGES = [{"role": "user", "content": "Hello"}]
+
+
+def measure_sync(model: OpenRouter, calls: int) -> List[float]:
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        model.get_client().chat.completions.create(model=model.id, messages=MESSAGES)  # type: ignore
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def measure_async(model: OpenRouter, calls: int) -> List[float]:
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await model.get_async_client().chat.completions.create(model=model.id, messages=MESSAGES)  # type: ignore
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(name: str, timings: List[float]) -> float:
+    median = statistics.median(timings)
+    print(f"{name:<28} {median * 1000:>8.2f}ms {statistics.mean(timings) * 1000:>8.2f}ms")
+    return median
+
+
+def main(args: argparse.Namespace) -> None:
+    server = start_stub(args.port)
+    base_url = f"http://127.0.0.1:{args.port}/v1"
+    per_request = OpenRouter(id="stub", api_key="stub", base_url=base_url)
+    pooled = PooledOpenRouter(id="stub", api_key="stub", base_url=base_url)
+
+    print(f"{'client':<28} {'median':>10} {'mean':>10}")
+    sync_saved = report("sync, client per request", measure_sync(per_request, args.calls)) - report(
+        "sync, shared pool", measure_sync(pooled, args.calls)
+    )
+
+    async def run_async() -> float:
+        saved = report("async, client per request", await measure_async(per_request, args.calls)) - report(
+            "async, shared pool", await measure_async(pooled, args.calls)
+        )
+        print(f"\npool after the run: {get_http_pool_metrics()}")
+        return saved
+
+    async_saved = asyncio.run(run_async())
+    print(f"saved per call: sync {sync_saved * 1000:.2f}ms, async {async_saved * 1000:.2f}ms")
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200, help="Chat completions per client")
+    parser.add_argument("--port", type=int, default=8788, help="Port of the local stub server")
+    main(parser.parse_args())
@@ -0,0 +1,113 @@
+"""Evaluate knowledge search: vector-only, keyword-only and hybrid search (linear and RRF fusion).
+
+Loads the fixture corpus (benchmarks/fixtures/hybrid_search.json) into a scratch
+TunedPgVector table with the embedder Sage uses, then runs every query in every mode and
+reports recall@k, MRR and nDCG@k against the labelled relevant documents, with p50/p95
+search latency. Query embeddings are cached before timing, so latencies are those of the
+database. Pass your own corpus with the same format to evaluate it. Needs Postgres with
+pgvector and the embedding model's credentials.
+
+Usage:
+    python -m benchmarks.hybrid_search --k 5 --rrf-weights 1:1 1:2 2:1
+"""
+
+# Apply agno-ck metadata fix before any agno imports
+import agno_metadata_fix
+
+import argparse
+import json
+import math
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from agno.document import Document
+
+from agents.settings import agent_settings
+from db.session import db_engine
+from knowledge.embeddings import CachedOpenAIEmbedder
+from knowledge.ingestion import upsert_chunks
+from knowledge.settings import knowledge_settings
+from knowledge.vector_index import TunedPgVector
+
+FIXTURE = Path(__file__).parent / "fixtures" / "hybrid_search.json"
+
+
+def evaluate(
+    search: Callable[[str], List[Document]], queries: List[dict], k: int, repeat: int
+) -> Tuple[float, float, float, float, float]:
+    """Returns (recall@k, MRR, nDCG@k, p50 ms, p95 ms) of the queries."""
+    recall, reciprocal_rank, ndcg, timings = 0.0, 0.0, 0.0, []
+    for query in queries:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results = search(query["query"])
+            timings.append((time.perf_counter() - start) * 1000)
+        relevant = set(query["relevant"])
+        names = [document.name for document in results[:k]]
+        recall += len(relevant.intersection(names)) / len(relevant)
+        ranks = [rank for rank, name in enumerate(names, start=1) if name in relevant]
+        reciprocal_rank += 1 / ranks[0] if ranks else 0.0
+        ideal = sum(1 / math.log2(rank + 1) for rank in range(1, min(len(relevant), k) + 1))
+        ndcg += sum(1 / math.log2(rank + 1) for rank in ranks) / ideal
+    timings.sort()
+    n = len(queries)
+    return recall / n, reciprocal_rank / n, ndcg / n, statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def main(args: argparse.Namespace) -> None:
+    corpus = json.loads(Path(args.corpus).read_text())
+    vector_db = TunedPgVector(
+        table_name="benchmark_hybrid_search",
+        db_engine=db_engine,
+        embedder=CachedOpenAIEmbedder(id=agent_settings.embedding_model),
+        content_language=args.text_search_config,
+    )
+    vector_db.drop()
+    vector_db.create()
+    documents = [Document(name=document["id"], content=document["content"]) for document in corpus["documents"]]
+    upsert_chunks(vector_db, documents)
+    queries = corpus["queries"]
+    for query in queries:
+        vector_db.embedder.get_embedding(query["query"])
+
+    modes: Dict[str, Callable[[str], List[Document]]] = {
+        "vector": lambda query: vector_db.vector_search(query, limit=args.k),
+        "keyword": lambda query: vector_db.keyword_search(query, limit=args.k),
+    }
+
+    def hybrid(fusion: str, vector_weight: float = 1.0, keyword_weight: float = 1.0) -> Callable:
+        def search(query: str) -> List[Document]:
+            vector_db.hybrid_fusion = fusion
+            vector_db.rrf_vector_weight, vector_db.rrf_keyword_weight = vector_weight, keyword_weight
+            return vector_db.hybrid_search(query, limit=args.k)
+
+        return search
+
+    modes["hybrid linear"] = hybrid("linear")
+    for weights in args.rrf_weights:
+        vector_weight, keyword_weight = (float(weight) for weight in weights.split(":"))
+        modes[f"hybrid rrf {weights}"] = hybrid("rrf", vector_weight, keyword_weight)
+
+    print(f"{len(documents)} documents, {len(queries)} queries, text search config {vector_db.content_language}")
+    print(f"{'mode':<18} {f'recall@{args.k}':>9} {'MRR':>6} {f'nDCG@{args.k}':>8} {'p50':>9} {'p95':>9}")
+    for mode, search in modes.items():
+        recall, mrr, ndcg, p50, p95 = evaluate(search, queries, args.k, args.repeat)
+        print(f"{mode:<18} {recall:>9.3f} {mrr:>6.3f} {ndcg:>8.3f} {p50:>7.1f}ms {p95:>7.1f}ms")
+
+    if not args.keep:
+        vector_db.drop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=str(FIXTURE), help="JSON file with documents and labelled queries")
+    parser.add_argument("--k", type=int, default=5, help="Results per query")
+    parser.add_argument("--rrf-weights", nargs="+", default=["1:1"], help="vector:keyword weights of RRF to compare")
+    parser.add_argument(
+        "--text-search-config", default=knowledge_settings.text_search_config, help="Postgres text search configuration"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Times each query is timed")
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark table")
+    main(parser.parse_args())
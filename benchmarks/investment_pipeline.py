@@ -0,0 +1,124 @@
+"""Benchmark InvestmentReportGenerator: sequential stages vs. pipelined mode.
+
+The three Agents are replaced by stubs whose "model" answers after a fixed time to first
+token and then emits tokens at a fixed latency, and market data is fetched with a fixed
+latency, so the measurement isolates the critical path of the workflow itself.
+Output scales with the number of companies in the input, like a real report does.
+
+Usage:
+    python -m benchmarks.investment_pipeline --companies AAPL,MSFT,NVDA,GOOG,TSLA
+"""
+
+# Apply agno-ck metadata fix before any agno imports
+import agno_metadata_fix
+
+import argparse
+import re
+import time
+from typing import Iterator, Optional, Tuple
+
+from agno.agent import RunResponse
+
+from workflows.investment_report_generator import InvestmentReportGenerator
+
+
+class StubMarketData:
+    """Market data tools that answer after `latency` seconds."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def _fetch(self, symbol: str, data_type: str) -> str:
+        time.sleep(self.latency)
+        return f"{data_type} for {symbol}"
+
+    def get_company_info(self, symbol: str) -> str:
+        return self._fetch(symbol, "company_info")
+
+    def get_analyst_recommendations(self, symbol: str) -> str:
+        return self._fetch(symbol, "analyst_recommendations")
+
+    def get_company_news(self, symbol: str) -> str:
+        return self._fetch(symbol, "company_news")
+
+
+class StubAgent:
+    """
+    Stands in for an Agent with a model that has fixed latencies.
+
+    It writes `tokens_per_company` tokens for every "## TICKER" section of its input, under the
+    same headings, so downstream stages see as many companies as the real report would.
+    """
+
+    def __init__(self, name: str, first_token: float, token_latency: float, tokens_per_company: int):
+        self.name = name
+        self.agent_id: Optional[str] = None
+        self.session_id: Optional[str] = None
+        self.run_response: Optional[RunResponse] = None
+        self.first_token = first_token
+        self.token_latency = token_latency
+        self.tokens_per_company = tokens_per_company
+
+    def deep_copy(self) -> "StubAgent":
+        return StubAgent(self.name, self.first_token, self.token_latency, self.tokens_per_company)
+
+    def _generate(self, message: str) -> Iterator[str]:
+        tickers = list(dict.fromkeys(re.findall(r"^## (\S+)", message, re.MULTILINE))) or ["REPORT"]
+        time.sleep(self.first_token)
+        for ticker in tickers:
+            yield f"## {ticker}\n"
+            for _ in range(self.tokens_per_company):
+                time.sleep(self.token_latency)
+                yield "token "
+            yield "\n"
+
+    def run(self, message: str, stream: bool = False):
+        if stream:
+            return self._stream(message)
+        self.run_response = RunResponse(content="".join(self._generate(message)), agent_name=self.name)
+        return self.run_response
+
+    def _stream(self, message: str) -> Iterator[RunResponse]:
+        content = ""
+        for token in self._generate(message):
+            content += token
+            yield RunResponse(content=token, agent_name=self.name)
+        self.run_response = RunResponse(content=content, agent_name=self.name)
+
+
+def measure(pipelined: bool, companies: str, args: argparse.Namespace) -> Tuple[float, float]:
+    """Returns (seconds to first content, seconds to the end of the report)."""
+    workflow = InvestmentReportGenerator()
+    workflow.pipelined = pipelined
+    workflow.market_data_tools = StubMarketData(args.fetch_latency)  # type: ignore
+    for name in ("stock_analyst", "research_analyst", "investment_lead"):
+        stub = StubAgent(name, args.first_token, args.token_latency, args.tokens_per_company)
+        setattr(workflow, name, stub)
+
+    start = time.perf_counter()
+    first_content: Optional[float] = None
+    for response in workflow.run(companies=companies):
+        # Stage headings are sent before any model output, they do not count as content
+        if first_content is None and response.content and not response.content.startswith("## "):
+            first_content = time.perf_counter() - start
+    total = time.perf_counter() - start
+    return first_content if first_content is not None else total, total
+
+
+def main(args: argparse.Namespace) -> None:
+    sequential = measure(False, args.companies, args)
+    pipelined = measure(True, args.companies, args)
+    print(f"{'mode':<11} {'first content':>14} {'total':>9}")
+    print(f"{'sequential':<11} {sequential[0]:>13.2f}s {sequential[1]:>8.2f}s")
+    print(f"{'pipelined':<11} {pipelined[0]:>13.2f}s {pipelined[1]:>8.2f}s")
+    print(f"critical path reduction: {(1 - pipelined[1] / sequential[1]) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--companies", default="AAPL,MSFT,NVDA,GOOG,TSLA", help="Companies to report on")
+    parser.add_argument("--first-token", type=float, default=0.5, help="Seconds until a model's first token")
+    parser.add_argument("--token-latency", type=float, default=0.002, help="Seconds per output token")
+    parser.add_argument("--tokens-per-company", type=int, default=300, help="Output tokens per company and stage")
+    parser.add_argument("--fetch-latency", type=float, default=0.3, help="Seconds per market data request")
+    main(parser.parse_args())
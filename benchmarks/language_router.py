@@ -0,0 +1,102 @@
+"""Benchmark the multi-language team pre-router against routing through the leader model.
+
+Runs a mixed-language prompt set through route_language() and reports how many prompts
+skip the leader and how long routing takes locally. With --with-model, every prompt
+also runs through the Team and straight through the pre-routed member agent, so the
+latency and the leader tokens of the saved model round trip are measured too.
+
+Usage:
+    python -m benchmarks.language_router --with-model
+"""
+
+# Apply agno-ck metadata fix before any agno imports
+import agno_metadata_fix
+
+import argparse
+import statistics
+import time
+from typing import List, Optional, Tuple
+from uuid import uuid4
+
+from teams.language_router import route_language
+
+# (prompt, expected language or None when the leader should answer)
+PROMPTS: List[Tuple[str, Optional[str]]] = [
+    ("¿Cuál es la capital de Argentina y qué lugares debería visitar?", "spanish"),
+    ("¿Puedes explicarme cómo funciona la fotosíntesis?", "spanish"),
+    ("Quelle est la meilleure saison pour visiter Paris ?", "french"),
+    ("Pouvez-vous m'expliquer comment fonctionne un moteur électrique ?", "french"),
+    ("Wie funktioniert ein Kernkraftwerk und ist es sicher?", "german"),
+    ("Kannst du mir ein gutes Rezept für Apfelstrudel geben?", "german"),
+    ("東京でおすすめの観光地はどこですか？", "japanese"),
+    ("日本の伝統的な料理について教えてください。", "japanese"),
+    ("北京有哪些值得参观的地方？", "chinese"),
+    ("请解释一下什么是人工智能。", "chinese"),
+    ("What are the main causes of climate change?", None),
+    ("Qual è la ricetta migliore per la carbonara?", None),
+    ("Answer in French: what is the tallest mountain in Europe?", "french"),
+    ("Hola", None),
+    # Languages mentioned in English prose are topics, not requests to answer in them
+    ("Tell me about the history of cars in German industry", None),
+    ("Best restaurants in French Quarter New Orleans", None),
+    ("How do I say hello in Spanish?", None),
+]
+
+
+def measure_routing() -> None:
+    correct = 0
+    routed = 0
+    timings = []
+    for prompt, expected in PROMPTS:
+        start = time.perf_counter()
+        language = route_language(prompt)
+        timings.append(time.perf_counter() - start)
+        routed += language is not None
+        # Leaving a prompt to the leader is never wrong, routing it to the wrong member is
+        correct += language == expected or language is None
+        print(f"{str(language):<10} {str(expected):<10} {prompt}")
+    print(
+        f"\npre-routed: {routed}/{len(PROMPTS)}  not misrouted: {correct}/{len(PROMPTS)}  "
+        f"median routing time: {statistics.median(timings) * 1e6:.0f}µs"
+    )
+
+
+def total_tokens(metrics: Optional[dict]) -> int:
+    return sum((metrics or {}).get("total_tokens", []))
+
+
+def measure_model() -> None:
+    from teams.multi_language import get_multi_language_team, route_to_member
+
+    team_seconds, member_seconds, leader_tokens = [], [], []
+    for prompt, _ in PROMPTS:
+        team = get_multi_language_team(session_id=str(uuid4()), debug_mode=False)
+        member = route_to_member(team, prompt)
+        if member is None:
+            continue
+
+        start = time.perf_counter()
+        team.run(prompt)
+        team_seconds.append(time.perf_counter() - start)
+        # The team run's own metrics are the leader's, member runs are reported separately
+        leader_tokens.append(total_tokens(team.run_response.metrics if team.run_response else None))
+
+        start = time.perf_counter()
+        member.run(prompt)
+        member_seconds.append(time.perf_counter() - start)
+
+    if not team_seconds:
+        return
+    print(
+        f"via leader: {statistics.median(team_seconds):.2f}s  pre-routed: {statistics.median(member_seconds):.2f}s  "
+        f"leader tokens saved per prompt: {statistics.mean(leader_tokens):.0f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--with-model", action="store_true", help="Also run the prompts through the models")
+    args = parser.parse_args()
+    measure_routing()
+    if args.with_model:
+        measure_model()
@@ -0,0 +1,97 @@
+"""Load test the Assistant's Ollama client: a new OllamaAsyncClient per request vs. the shared one.
+
+Starts a local Ollama-compatible stub server that answers /api/chat after --latency seconds
+and sends --requests chats at --concurrency, once with a client built per request (as
+get_assistant used to) and once with the client shared by PooledOllama. The stub speaks
+plain HTTP, against https://ollama.com every new client also pays a TLS handshake.
+
+Usage:
+    python -m benchmarks.ollama_load --requests 500 --concurrency 20
+"""
+
+# Apply agno-ck metadata fix before any agno imports
+import agno_metadata_fix
+
+import argparse
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+import uvicorn
+from fastapi import FastAPI
+from ollama import AsyncClient as OllamaAsyncClient
+
+from models.ollama import aclose_ollama_clients, get_ollama_async_client
+from utils.metrics import percentile
+
+stub = FastAPI()
+stub_latency = 0.0
+
+
+@stub.post("/api/chat")
+async def chat(body: Dict[str, Any]) -> Dict[str, Any]:
+    await asyncio.sleep(stub_latency)
+    return {
+        "model": body.get("model", "stub"),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "message": {"role": "assistant", "content": "ok"},
+        "done": True,
+        "done_reason": "stop",
+    }
+
+
+def start_stub(port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(stub, port=port, log_level="warning", backlog=4096))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def load(get_client: Callable[[], OllamaAsyncClient], requests: int, concurrency: int) -> List[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    timings: List[float] = []
+
+    async def one() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await get_client().chat(model="gpt-oss:120b", messages=[{"role": "user", "content": "Hello"}])
+            timings.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return timings
+
+
+def report(name: str, timings: List[float], seconds: float) -> None:
+    print(
+        f"{name:<20} {percentile(timings, 50) * 1000:>8.1f}ms {percentile(timings, 99) * 1000:>8.1f}ms "
+        f"{len(timings) / seconds:>8.0f}/s"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    host = f"http://127.0.0.1:{args.port}"
+    print(f"{'client':<20} {'p50':>10} {'p99':>10} {'throughput':>10}")
+    for name, get_client in (
+        ("per request", lambda: OllamaAsyncClient(host=host, headers={"Authorization": "Bearer stub"})),
+        ("shared", lambda: get_ollama_async_client(host, "stub")),
+    ):
+        start = time.perf_counter()
+        timings = await load(get_client, args.requests, args.concurrency)
+        report(name, timings, time.perf_counter() - start)
+    await aclose_ollama_clients()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="Number of chat requests per client")
+    parser.add_argument("--concurrency", type=int, default=20, help="Requests in flight at a time")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds the stub takes per answer")
+    parser.add_argument("--port", type=int, default=8789, help="Port of the local stub server")
+    args = parser.parse_args()
+    stub_latency = args.latency
+    server = start_stub(args.port)
+    asyncio.run(main(args))
+    server.should_exit = True
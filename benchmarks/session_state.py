@@ -0,0 +1,119 @@
+"""Benchmark BlogPostGenerator session_state save/load time as topics accumulate.
+
+Fills session_state the way the workflow does for each new topic, then times a save of
+the workflow session through PostgresStorage (as Workflow.write_to_storage does) and a
+load of it followed by reading back one topic's articles, as a cache hit does. "before"
+stores uncompressed articles for every topic, "after" applies the max_session_topics cap
+and compression. Uses a scratch table, needs the database used by the workflow.
+
+Usage:
+    python -m benchmarks.session_state --topics 500
+"""
+
+# Apply agno-ck metadata fix before any agno imports
+import agno_metadata_fix
+
+import argparse
+import json
+import time
+from typing import Any, Dict, Tuple
+
+from agno.storage.postgres import PostgresStorage
+from agno.storage.session.workflow import WorkflowSession
+from agno.utils.common import nested_model_dump
+
+from db.session import db_engine
+from workflows.blog_post_generator import (
+    BlogPostGenerator,
+    NewsArticle,
+    ScrapedArticle,
+    SearchResults,
+    pack_scraped_articles,
+    unpack_scraped_articles,
+)
+
+ARTICLES_PER_TOPIC = 6
+WORDS_PER_ARTICLE = 1500
+BLOG_POST_WORDS = 1200
+
+
+def make_topic(i: int) -> Tuple[SearchResults, Dict[str, ScrapedArticle], str]:
+    articles = [
+        NewsArticle(title=f"Article {i}-{j}", url=f"https://example.com/{i}/{j}", summary=f"Summary {i}-{j}")
+        for j in range(ARTICLES_PER_TOPIC)
+    ]
+    scraped_articles = {
+        a.url: ScrapedArticle(
+            title=a.title,
+            url=a.url,
+            summary=a.summary,
+            content=" ".join(f"word{(i * 7 + j + k) % 997}" for k in range(WORDS_PER_ARTICLE)),
+        )
+        for j, a in enumerate(articles)
+    }
+    blog_post = " ".join(f"post{(i + k) % 499}" for k in range(BLOG_POST_WORDS))
+    return SearchResults(articles=articles), scraped_articles, blog_post
+
+
+def add_topic(state: Dict[str, Any], workflow: BlogPostGenerator, i: int, compact: bool) -> None:
+    search_results, scraped_articles, blog_post = make_topic(i)
+    topic = f"topic {i}"
+    if compact:
+        workflow.add_session_entry("search_results", topic, search_results.model_dump())
+        workflow.add_session_entry("scraped_articles", topic, pack_scraped_articles(scraped_articles))
+        workflow.add_session_entry("blog_posts", topic, blog_post)
+    else:
+        state.setdefault("search_results", {})[topic] = search_results
+        state.setdefault("scraped_articles", {})[topic] = scraped_articles
+        state.setdefault("blog_posts", {})[topic] = blog_post
+
+
+def save_and_load(
+    storage: PostgresStorage, session_id: str, state: Dict[str, Any], topic: str
+) -> Tuple[float, float, int]:
+    """Returns (save seconds, load seconds, session_state bytes)."""
+    start = time.perf_counter()
+    session_state = nested_model_dump(state)
+    storage.upsert(
+        WorkflowSession(
+            session_id=session_id,
+            workflow_id="benchmark-session-state",
+            session_data={"session_state": session_state},
+        )
+    )
+    save = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loaded = storage.read(session_id=session_id)
+    unpack_scraped_articles(loaded.session_data["session_state"]["scraped_articles"][topic])  # type: ignore
+    load = time.perf_counter() - start
+    return save, load, len(json.dumps(session_state))
+
+
+def main(num_topics: int, every: int) -> None:
+    storage = PostgresStorage(table_name="benchmark_session_state", db_engine=db_engine, mode="workflow")
+    storage.drop()
+    storage.create()
+    print(f"{'topics':>6}  {'before save':>11} {'load':>8} {'row':>9}   {'after save':>10} {'load':>8} {'row':>9}")
+    workflow = BlogPostGenerator.__new__(BlogPostGenerator)
+    workflow.session_state = {}
+    before: Dict[str, Any] = {}
+    for i in range(1, num_topics + 1):
+        add_topic(before, workflow, i, compact=False)
+        add_topic(workflow.session_state, workflow, i, compact=True)
+        if i % every == 0 or i == 1:
+            b_save, b_load, b_size = save_and_load(storage, "before", before, f"topic {i}")
+            a_save, a_load, a_size = save_and_load(storage, "after", workflow.session_state, f"topic {i}")
+            print(
+                f"{i:>6}  {b_save * 1000:>9.1f}ms {b_load * 1000:>6.1f}ms {b_size / 1e6:>7.1f}MB"
+                f"   {a_save * 1000:>8.1f}ms {a_load * 1000:>6.1f}ms {a_size / 1e6:>7.1f}MB"
+            )
+    storage.drop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topics", type=int, default=300, help="Number of topics to add to one session")
+    parser.add_argument("--every", type=int, default=50, help="Report every N topics")
+    args = parser.parse_args()
+    main(args.topics, args.every)
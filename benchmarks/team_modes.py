@@ -0,0 +1,60 @@
+"""Benchmark the finance researcher Team: "route" vs. parallel "collaborate" mode on the same prompts.
+
+Reports time to first content and total run time per mode. In route mode a question that
+needs both market data and news only gets one member's answer, so compare the answers too.
+Needs the model credentials and the database used by the Team.
+
+Usage:
+    python -m benchmarks.team_modes --repeat 2
+"""
+
+# Apply agno-ck metadata fix before any agno imports
+import agno_metadata_fix
+
+import argparse
+import asyncio
+import time
+from typing import Tuple
+from uuid import uuid4
+
+from teams.finance_researcher import get_finance_researcher_team
+from utils.metrics import LatencyMetrics
+
+PROMPTS = [
+    "What is the current stock price of NVDA and what is the latest news about it?",
+    "Compare the analyst recommendations for AAPL and MSFT and summarize recent headlines for both.",
+    "How did TSLA stock react to its latest earnings, and what are analysts saying?",
+]
+
+
+async def run_prompt(mode: str, prompt: str) -> Tuple[float, float]:
+    """Returns (seconds to first content, total seconds) for one run."""
+    team = get_finance_researcher_team(session_id=str(uuid4()), debug_mode=False, mode=mode)  # type: ignore
+    start = time.perf_counter()
+    first_content = None
+    async for chunk in await team.arun(prompt, stream=True):
+        if first_content is None and getattr(chunk, "content", None):
+            first_content = time.perf_counter() - start
+    total = time.perf_counter() - start
+    return first_content if first_content is not None else total, total
+
+
+async def main(repeat: int) -> None:
+    latency = LatencyMetrics()
+    for mode in ("route", "collaborate"):
+        for _ in range(repeat):
+            for prompt in PROMPTS:
+                first_content, total = await run_prompt(mode, prompt)
+                latency.record(f"{mode}:first_content", first_content)
+                latency.record(mode, total)
+
+    print(f"{'mode':<25} {'runs':>5} {'mean':>8} {'p50':>8} {'p95':>8}")
+    for key, metrics in latency.get_metrics().items():
+        print(f"{key:<25} {metrics['count']:>5} {metrics['mean']:>7.2f}s {metrics['p50']:>7.2f}s {metrics['p95']:>7.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=1, help="Number of times each prompt is run per mode")
+    args = parser.parse_args()
+    asyncio.run(main(args.repeat))
@@ -0,0 +1,158 @@
+"""Benchmark the ANN index of knowledge tables: recall@k vs. search latency for HNSW and IVFFlat.
+
+Loads synthetic, clustered embeddings into a scratch PgVector table per size, builds each
+index the way ingestion does (see knowledge/vector_index.py) and sweeps the query-time
+setting (ef_search for HNSW, probes for IVFFlat). Recall is measured against the exact
+nearest neighbours computed in numpy, latency is that of TunedPgVector.search. The
+"exact" row is a sequential scan without an index. Needs Postgres with pgvector, 1M rows
+of 384 dimensions take about 2GB of table and a few minutes per index build.
+
+Usage:
+    python -m benchmarks.vector_index --sizes 10000 100000 1000000
+"""
+
+# Apply agno-ck metadata fix before any agno imports
+import agno_metadata_fix
+
+import argparse
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from agno.document import Document
+from agno.embedder import Embedder
+from agno.vectordb.pgvector import SearchType
+from agno.vectordb.pgvector.index import HNSW, Ivfflat
+from sqlalchemy import text
+
+from db.session import db_engine
+from knowledge.ingestion import upsert_chunks
+from knowledge.vector_index import TunedPgVector, search_params
+
+
+@dataclass
+class SyntheticEmbedder(Embedder):
+    """Looks up the embedding of "chunk N" and "query N" texts in generated vectors."""
+
+    chunks: np.ndarray = field(default_factory=lambda: np.zeros((0, 0), dtype=np.float32))
+    queries: np.ndarray = field(default_factory=lambda: np.zeros((0, 0), dtype=np.float32))
+
+    def get_embedding(self, text: str) -> List[float]:
+        kind, number = text.split()
+        vectors = self.chunks if kind == "chunk" else self.queries
+        return vectors[int(number)].tolist()
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        return self.get_embedding(text), None
+
+
+def generate(size: int, queries: int, dimensions: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Unit vectors around sqrt(size) cluster centres, real embeddings are clustered by topic too."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((max(int(np.sqrt(size)), 1), dimensions), dtype=np.float32)
+    chunks = centres[rng.integers(len(centres), size=size)]
+    chunks += 0.5 * rng.standard_normal(chunks.shape, dtype=np.float32)
+    query_vectors = centres[rng.integers(len(centres), size=queries)]
+    query_vectors += 0.5 * rng.standard_normal(query_vectors.shape, dtype=np.float32)
+    chunks /= np.linalg.norm(chunks, axis=1, keepdims=True)
+    query_vectors /= np.linalg.norm(query_vectors, axis=1, keepdims=True)
+    return chunks, query_vectors
+
+
+def exact_neighbours(chunks: np.ndarray, queries: np.ndarray, k: int) -> List[set]:
+    neighbours = []
+    for query in queries:
+        # Cosine distance of unit vectors ranks like the negated dot product
+        similarity = chunks @ query
+        neighbours.append(set(np.argpartition(-similarity, k)[:k].tolist()))
+    return neighbours
+
+
+def load(vector_db: TunedPgVector, size: int, batch_size: int) -> float:
+    vector_db.drop()
+    vector_db.create()
+    start = time.perf_counter()
+    for offset in range(0, size, batch_size):
+        end = min(offset + batch_size, size)
+        upsert_chunks(vector_db, [Document(name="benchmark", content=f"chunk {i}") for i in range(offset, end)])
+    with db_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"VACUUM ANALYZE {vector_db.table.fullname}"))
+    return time.perf_counter() - start
+
+
+def measure(
+    vector_db: TunedPgVector, queries: int, k: int, truth: List[set], **params: Optional[int]
+) -> Tuple[float, float, float]:
+    """Returns (recall@k, p50 ms, p95 ms) of the queries."""
+    found, timings = 0, []
+    with search_params(**params):
+        for i in range(queries):
+            start = time.perf_counter()
+            results = vector_db.search(f"query {i}", limit=k)
+            timings.append((time.perf_counter() - start) * 1000)
+            found += len({int(document.content.split()[1]) for document in results} & truth[i])
+    timings.sort()
+    return found / (queries * k), statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def run_size(size: int, args: argparse.Namespace) -> None:
+    chunks, query_vectors = generate(size, args.queries, args.dimensions, args.seed)
+    truth = exact_neighbours(chunks, query_vectors, args.k)
+    vector_db = TunedPgVector(
+        table_name=f"benchmark_knowledge_{size}",
+        db_engine=db_engine,
+        search_type=SearchType.vector,
+        embedder=SyntheticEmbedder(dimensions=args.dimensions, chunks=chunks, queries=query_vectors),
+    )
+    index_name = f"benchmark_knowledge_{size}_ann_index"
+    print(f"\n{size} chunks: loaded in {load(vector_db, size, args.batch_size):.0f}s")
+    print(f"{'index':<30} {'build':>8} {'setting':>12} {f'recall@{args.k}':>10} {'p50':>9} {'p95':>9}")
+
+    recall, p50, p95 = measure(vector_db, args.queries, args.k, truth)
+    print(f"{'exact':<30} {'':>8} {'':>12} {recall:>10.3f} {p50:>7.1f}ms {p95:>7.1f}ms")
+
+    configurations = [
+        HNSW(name=index_name, m=m, ef_construction=ef_construction)
+        for m in args.hnsw_m
+        for ef_construction in args.hnsw_ef_construction
+    ]
+    # sqrt(rows) lists is pgvector's advice above 1M rows, rows / 1000 below
+    lists = args.ivfflat_lists or [max(size // 1000, 1), max(int(np.sqrt(size)), 1)]
+    configurations += [Ivfflat(name=index_name, lists=n, dynamic_lists=False) for n in dict.fromkeys(lists)]
+    for index in configurations:
+        vector_db.vector_index = index
+        start = time.perf_counter()
+        vector_db.build_index()
+        build = time.perf_counter() - start
+        if isinstance(index, HNSW):
+            label, setting, values = f"hnsw m={index.m} efc={index.ef_construction}", "ef_search", args.ef_search
+        else:
+            label, setting, values = f"ivfflat lists={index.lists}", "probes", args.probes
+        for value in values:
+            recall, p50, p95 = measure(vector_db, args.queries, args.k, truth, **{setting: value})
+            print(f"{label:<30} {build:>7.0f}s {f'{setting}={value}':>12} {recall:>10.3f} {p50:>7.1f}ms {p95:>7.1f}ms")
+            label, build = "", 0.0
+
+    if not args.keep:
+        vector_db.drop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000], help="Chunks per table")
+    parser.add_argument("--dimensions", type=int, default=384, help="Embedding dimensions")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per setting")
+    parser.add_argument("--k", type=int, default=10, help="Results per query")
+    parser.add_argument("--hnsw-m", type=int, nargs="+", default=[16], help="HNSW m values to build")
+    parser.add_argument("--hnsw-ef-construction", type=int, nargs="+", default=[64, 200], help="HNSW ef_construction")
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[10, 20, 40, 80, 160], help="HNSW ef_search sweep")
+    parser.add_argument("--ivfflat-lists", type=int, nargs="+", help="IVFFlat lists, rows/1000 and sqrt(rows) if unset")
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 5, 10, 20, 50], help="IVFFlat probes sweep")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Chunks per insert statement")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark tables")
+    args = parser.parse_args()
+    for size in args.sizes:
+        run_size(size, args)
@@ -0,0 +1,273 @@
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Engine
+
+from db.session import db_engine
+from db.tables.cache import CacheEntry
+from utils.log import logger
+
+# Every PgCache and MemoryCache created in this process, keyed by namespace
+_caches: Dict[str, Any] = {}
+
+_table_lock = Lock()
+_table_ready = False
+
+
+def normalize_message(text: str) -> str:
+    """
+    Normalize the Unicode form, case and whitespace of a message, so "What is  RAG?" and "what is rag?"
+    share a cache entry. Punctuation is kept, it changes the meaning of "2+2?" and "2-2?".
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def normalize_key(text: str) -> str:
+    """Normalize a free-text topic key, so "  AI Agents!" and "ai agents" share a cache entry."""
+    return normalize_message(re.sub(r"[^\w\s]", " ", unicodedata.normalize("NFKC", text)))
+
+
+class PgCache:
+    """
+    A namespaced key/value cache in the shared `cache_entries` table.
+
+    Entries expire after `ttl` seconds and each namespace keeps at most `max_entries`,
+    evicting the least recently used. Values must be JSON serializable.
+    Database errors are logged and treated as misses, the cache never fails the caller.
+    """
+
+    def __init__(self, namespace: str, ttl: int, max_entries: int = 1000, db_engine: Engine = db_engine):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.db_engine = db_engine
+        self.table = CacheEntry.__table__
+
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self.errors = 0
+
+        _caches[namespace] = self
+
+    def _ensure_table(self) -> None:
+        # The table is created by the alembic migration, this covers databases that were not migrated yet
+        global _table_ready
+        if _table_ready:
+            return
+        with _table_lock:
+            if not _table_ready:
+                self.table.create(self.db_engine, checkfirst=True)
+                _table_ready = True
+
+    def _count(self, counter: str, n: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + n)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached value for key, or None if it is missing or expired."""
+        stmt = (
+            update(self.table)
+            .where(
+                self.table.c.namespace == self.namespace,
+                self.table.c.key == key,
+                self.table.c.expires_at > func.now(),
+            )
+            .values(last_accessed_at=func.now(), hits=self.table.c.hits + 1)
+            .returning(self.table.c.value)
+        )
+        try:
+            self._ensure_table()
+            with self.db_engine.begin() as conn:
+                value = conn.execute(stmt).scalar_one_or_none()
+        except Exception as e:
+            logger.warning(f"Could not read {self.namespace} cache: {e}")
+            self._count("errors")
+            value = None
+
+        self._count("hits" if value is not None else "misses")
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store value under key for `ttl` seconds (default: self.ttl), then evict expired and least recently used."""
+        now = datetime.now(timezone.utc)
+        values = {
+            "value": value,
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=ttl if ttl is not None else self.ttl),
+            "last_accessed_at": now,
+        }
+        stmt = postgresql.insert(self.table).values(namespace=self.namespace, key=key, **values)
+        stmt = stmt.on_conflict_do_update(index_elements=["namespace", "key"], set_=values)
+
+        # Everything past the newest max_entries, ordered by last access
+        overflow = (
+            select(self.table.c.key)
+            .where(self.table.c.namespace == self.namespace)
+            .order_by(self.table.c.last_accessed_at.desc())
+            .offset(self.max_entries)
+            .scalar_subquery()
+        )
+        evict = delete(self.table).where(
+            self.table.c.namespace == self.namespace,
+            (self.table.c.expires_at <= func.now()) | self.table.c.key.in_(overflow),
+        )
+        try:
+            self._ensure_table()
+            with self.db_engine.begin() as conn:
+                conn.execute(stmt)
+                evicted = conn.execute(evict).rowcount
+        except Exception as e:
+            logger.warning(f"Could not write {self.namespace} cache: {e}")
+            self._count("errors")
+            return
+
+        self._count("sets")
+        if evicted:
+            self._count("evictions", evicted)
+
+    def delete(self, key: str) -> None:
+        """Remove key from the cache."""
+        try:
+            self._ensure_table()
+            with self.db_engine.begin() as conn:
+                conn.execute(
+                    delete(self.table).where(self.table.c.namespace == self.namespace, self.table.c.key == key)
+                )
+        except Exception as e:
+            logger.warning(f"Could not delete from {self.namespace} cache: {e}")
+            self._count("errors")
+
+    def delete_prefix(self, prefix: str) -> None:
+        """Remove every key that starts with prefix."""
+        try:
+            self._ensure_table()
+            with self.db_engine.begin() as conn:
+                conn.execute(
+                    delete(self.table).where(
+                        self.table.c.namespace == self.namespace,
+                        self.table.c.key.startswith(prefix, autoescape=True),
+                    )
+                )
+        except Exception as e:
+            logger.warning(f"Could not delete from {self.namespace} cache: {e}")
+            self._count("errors")
+
+    def clear(self) -> None:
+        """Remove every entry in this namespace."""
+        try:
+            self._ensure_table()
+            with self.db_engine.begin() as conn:
+                conn.execute(delete(self.table).where(self.table.c.namespace == self.namespace))
+        except Exception as e:
+            logger.warning(f"Could not clear {self.namespace} cache: {e}")
+            self._count("errors")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Returns the hit/miss counters of this process."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "sets": self.sets,
+                "evictions": self.evictions,
+                "errors": self.errors,
+                "ttl": self.ttl,
+                "max_entries": self.max_entries,
+            }
+
+
+class MemoryCache:
+    """
+    An in-process cache with the interface of PgCache, for values that need not be shared between processes.
+
+    Entries expire after `ttl` seconds and at most `max_entries` are kept, evicting the least recently used.
+    """
+
+    def __init__(self, namespace: str, ttl: int, max_entries: int = 1000):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._lock = Lock()
+        # key -> (expires at on the monotonic clock, value), ordered from least to most recently used
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+
+        _caches[namespace] = self
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached value for key, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store value under key for `ttl` seconds (default: self.ttl), evicting the least recently used."""
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            self.sets += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        """Remove key from the cache."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        """Remove every key that starts with prefix."""
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Returns the hit/miss counters of this cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "sets": self.sets,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "ttl": self.ttl,
+                "max_entries": self.max_entries,
+            }
+
+
+def get_cache_metrics() -> Dict[str, Dict[str, Any]]:
+    """Returns the metrics of every PgCache and MemoryCache in this process, keyed by namespace."""
+    return {namespace: cache.get_metrics() for namespace, cache in _caches.items()}
@@ -0,0 +1,45 @@
+"""create cache_entries
+
+Revision ID: 3f1c2a7d9b10
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "3f1c2a7d9b10"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "cache_entries",
+        sa.Column("namespace", sa.String(length=128), nullable=False),
+        sa.Column("key", sa.Text(), nullable=False),
+        sa.Column("value", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_accessed_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("hits", sa.Integer(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("namespace", "key"),
+        schema="public",
+    )
+    op.create_index(
+        "ix_cache_entries_namespace_last_accessed_at",
+        "cache_entries",
+        ["namespace", "last_accessed_at"],
+        unique=False,
+        schema="public",
+    )
+    op.create_index("ix_cache_entries_expires_at", "cache_entries", ["expires_at"], unique=False, schema="public")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cache_entries_expires_at", table_name="cache_entries", schema="public")
+    op.drop_index("ix_cache_entries_namespace_last_accessed_at", table_name="cache_entries", schema="public")
+    op.drop_table("cache_entries", schema="public")
@@ -0,0 +1,45 @@
+"""create knowledge_documents
+
+Revision ID: 8b2e5d4c6a31
+Revises: 3f1c2a7d9b10
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "8b2e5d4c6a31"
+down_revision = "3f1c2a7d9b10"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "knowledge_documents",
+        sa.Column("knowledge_table", sa.String(length=256), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("chunk_hashes", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("chunks", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("knowledge_table", "name"),
+        schema="public",
+    )
+    op.create_index(
+        "ix_knowledge_documents_knowledge_table_content_hash",
+        "knowledge_documents",
+        ["knowledge_table", "content_hash"],
+        unique=False,
+        schema="public",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_knowledge_documents_knowledge_table_content_hash", table_name="knowledge_documents", schema="public"
+    )
+    op.drop_table("knowledge_documents", schema="public")
@@ -0,0 +1,32 @@
+"""create embedding_cache
+
+Revision ID: c4a9e1f07d52
+Revises: 8b2e5d4c6a31
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "c4a9e1f07d52"
+down_revision = "8b2e5d4c6a31"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "embedding_cache",
+        sa.Column("model", sa.String(length=128), nullable=False),
+        sa.Column("text_hash", sa.String(length=64), nullable=False),
+        sa.Column("embedding", postgresql.ARRAY(postgresql.REAL()), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("model", "text_hash"),
+        schema="public",
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("embedding_cache", schema="public")
@@ -0,0 +1,46 @@
+"""add content_tsv to sage_knowledge
+
+Revision ID: e7b3d2a9f418
+Revises: c4a9e1f07d52
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+from knowledge.settings import knowledge_settings
+
+# revision identifiers, used by Alembic.
+revision = "e7b3d2a9f418"
+down_revision = "c4a9e1f07d52"
+branch_labels = None
+depends_on = None
+
+# Generated tsvector column and GIN index of TunedPgVector (knowledge/vector_index.py), for tables created before it
+# had them. Adding the column rewrites the table once, the index is built without blocking writes.
+TABLE = "ai.sage_knowledge"
+INDEX = "sage_knowledge_content_tsv_index"
+
+
+def _table_exists() -> bool:
+    if context.is_offline_mode():
+        return True
+    return op.get_bind().execute(sa.text("SELECT to_regclass(:table)"), {"table": TABLE}).scalar() is not None
+
+
+def upgrade() -> None:
+    if not _table_exists():
+        # Created with the column and index by the app
+        return
+    op.execute(
+        f"ALTER TABLE {TABLE} ADD COLUMN IF NOT EXISTS content_tsv tsvector GENERATED ALWAYS AS "
+        f"(to_tsvector('{knowledge_settings.text_search_config}'::regconfig, coalesce(content, ''))) STORED"
+    )
+    with op.get_context().autocommit_block():
+        op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{INDEX}" ON {TABLE} USING gin (content_tsv)')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "ai"."{INDEX}"')
+    op.execute(f"ALTER TABLE IF EXISTS {TABLE} DROP COLUMN IF EXISTS content_tsv")
@@ -0,0 +1,164 @@
+import time
+from datetime import timedelta
+from hashlib import md5
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from agno.vectordb.pgvector import PgVector
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Engine
+
+from agents.settings import agent_settings
+from db.cache import normalize_message
+from db.session import db_engine
+from knowledge.embeddings import CachedOpenAIEmbedder
+from utils.log import logger
+
+
+class SemanticCache:
+    """
+    Answers looked up by the embedding of the message they answered, in a PgVector table.
+
+    Each scope (e.g. an agent, model and knowledge version) has its own entries and a lookup returns the
+    closest entry of the scope if its cosine similarity reaches `threshold`. Entries expire after `ttl`
+    seconds. Like PgCache, database and embedder errors are logged and treated as misses.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        ttl: int,
+        threshold: float = 0.95,
+        db_engine: Engine = db_engine,
+    ):
+        self.ttl = ttl
+        self.threshold = threshold
+        self.vector_db = PgVector(
+            table_name=table_name, db_engine=db_engine, embedder=CachedOpenAIEmbedder(id=agent_settings.embedding_model)
+        )
+        self.table = self.vector_db.table
+
+        self._lock = Lock()
+        self._table_ready = False
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.errors = 0
+        self.lookup_seconds = 0.0
+        # Run time of the answers served from the cache, minus the time their lookups took
+        self.seconds_saved = 0.0
+
+    def _ensure_table(self) -> None:
+        if not self._table_ready:
+            with self._lock:
+                if not self._table_ready:
+                    self.vector_db.create()
+                    self._table_ready = True
+
+    def _count(self, **counters: float) -> None:
+        with self._lock:
+            for counter, n in counters.items():
+                setattr(self, counter, getattr(self, counter) + n)
+
+    def get_embedding(self, message: str) -> Optional[List[float]]:
+        try:
+            return self.vector_db.embedder.get_embedding(normalize_message(message))
+        except Exception as e:
+            logger.warning(f"Could not embed message for the semantic cache: {e}")
+            self._count(errors=1)
+            return None
+
+    def get(
+        self, scope: str, message: str, threshold: Optional[float] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[List[float]]]:
+        """
+        Returns the cached answer closest to message in scope, if it is similar enough, and the embedding of message.
+
+        The embedding is returned on misses too, so `set` can store the answer without embedding message again.
+        """
+        start = time.perf_counter()
+        embedding = self.get_embedding(message)
+        entry: Optional[Dict[str, Any]] = None
+        if embedding is not None:
+            distance = self.table.c.embedding.cosine_distance(embedding).label("distance")
+            stmt = (
+                select(self.table.c.meta_data, distance)
+                .where(
+                    self.table.c.name == scope,
+                    self.table.c.created_at > func.now() - timedelta(seconds=self.ttl),
+                )
+                .order_by(distance)
+                .limit(1)
+            )
+            try:
+                self._ensure_table()
+                with self.vector_db.Session() as sess:
+                    row = sess.execute(stmt).first()
+                similarity = 1 - row.distance if row is not None else None
+                if similarity is not None and similarity >= (threshold if threshold is not None else self.threshold):
+                    entry = {**row.meta_data, "similarity": round(similarity, 4)}
+            except Exception as e:
+                logger.warning(f"Could not read semantic cache: {e}")
+                self._count(errors=1)
+
+        lookup_seconds = time.perf_counter() - start
+        if entry is not None:
+            self._count(hits=1, lookup_seconds=lookup_seconds, seconds_saved=entry["run_seconds"] - lookup_seconds)
+        else:
+            self._count(misses=1, lookup_seconds=lookup_seconds)
+        return entry, embedding
+
+    def set(self, scope: str, message: str, embedding: List[float], content: str, run_seconds: float) -> None:
+        """Store the answer to message in scope, replacing an earlier answer to the same normalized message."""
+        meta_data = {"content": content, "created_at": time.time(), "run_seconds": run_seconds}
+        values = {
+            "name": scope,
+            "meta_data": meta_data,
+            "content": message,
+            "embedding": embedding,
+            "created_at": func.now(),
+        }
+        entry_id = md5(f"{scope}:{normalize_message(message)}".encode()).hexdigest()
+        stmt = postgresql.insert(self.table).values(id=entry_id, **values)
+        stmt = stmt.on_conflict_do_update(index_elements=["id"], set_=values)
+        expired = delete(self.table).where(self.table.c.created_at <= func.now() - timedelta(seconds=self.ttl))
+        try:
+            self._ensure_table()
+            with self.vector_db.Session() as sess, sess.begin():
+                sess.execute(stmt)
+                sess.execute(expired)
+        except Exception as e:
+            logger.warning(f"Could not write semantic cache: {e}")
+            self._count(errors=1)
+            return
+        self._count(sets=1)
+
+    def invalidate(self, scope_prefix: str = "") -> int:
+        """Remove every entry whose scope starts with scope_prefix, or all entries. Returns the number removed."""
+        stmt = delete(self.table)
+        if scope_prefix:
+            stmt = stmt.where(self.table.c.name.startswith(scope_prefix, autoescape=True))
+        try:
+            self._ensure_table()
+            with self.vector_db.Session() as sess, sess.begin():
+                return sess.execute(stmt).rowcount
+        except Exception as e:
+            logger.warning(f"Could not invalidate semantic cache: {e}")
+            self._count(errors=1)
+            return 0
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Returns the hit/miss counters and the latency saved in this process."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "sets": self.sets,
+                "errors": self.errors,
+                "mean_lookup_seconds": round(self.lookup_seconds / lookups, 4) if lookups else None,
+                "seconds_saved": round(self.seconds_saved, 2),
+                "ttl": self.ttl,
+            }
@@ -1,17 +1,43 @@
-from typing import Generator
+from typing import Any, AsyncGenerator, Dict, Generator
 
 from sqlalchemy.engine import Engine, create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from db.settings import db_settings
 
 # Create SQLAlchemy Engine using a database URL
+# This engine and its connection pool are shared by all agents, teams and workflows in the process.
 db_url: str = db_settings.get_db_url()
-db_engine: Engine = create_engine(db_url, pool_pre_ping=True)
+db_engine: Engine = create_engine(
+    db_url,
+    pool_pre_ping=True,
+    pool_size=db_settings.db_pool_size,
+    max_overflow=db_settings.db_max_overflow,
+    pool_recycle=db_settings.db_pool_recycle,
+    pool_timeout=db_settings.db_pool_timeout,
+)
+
+# Create an async SQLAlchemy Engine for the same database
+# psycopg 3 serves both engines, so the database URL is reused as is.
+db_async_engine: AsyncEngine = create_async_engine(
+    db_url,
+    pool_pre_ping=True,
+    pool_size=db_settings.db_pool_size,
+    max_overflow=db_settings.db_max_overflow,
+    pool_recycle=db_settings.db_pool_recycle,
+    pool_timeout=db_settings.db_pool_timeout,
+)
 
 # Create a SessionLocal class
 SessionLocal: sessionmaker[Session] = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
 
+# Create an AsyncSessionLocal class
+AsyncSessionLocal: async_sessionmaker[AsyncSession] = async_sessionmaker(
+    autoflush=False, expire_on_commit=False, bind=db_async_engine
+)
+
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -25,3 +51,38 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get an async database session.
+
+    Yields:
+        AsyncSession: An SQLAlchemy async database session.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_db_pool_metrics(engine: Engine = db_engine) -> Dict[str, Any]:
+    """
+    Returns connection pool metrics for a database engine.
+
+    Args:
+        engine: The engine to report on. Defaults to the shared sync engine,
+            pass db_async_engine.sync_engine for the async one.
+
+    Returns:
+        Dict[str, Any]: Pool size, connections checked in/out and current overflow.
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": pool.status()}
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": db_settings.db_max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "status": pool.status(),
+    }
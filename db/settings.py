@@ -17,6 +17,14 @@ class DbSettings(BaseSettings):
     db_pass: Optional[str] = None
     db_database: Optional[str] = None
     db_driver: str = "postgresql+psycopg"
+    # Connection pool shared by every storage and vector db in the process
+    # The sync and async engines each get a pool of this size.
+    db_pool_size: int = 5
+    db_max_overflow: int = 5
+    # Recycle connections after this many seconds, so idle ones are not dropped by the server
+    db_pool_recycle: int = 1800
+    # Seconds to wait for a free connection before raising
+    db_pool_timeout: int = 30
     # Create/Upgrade database on startup using alembic
     migrate_db: bool = False
 
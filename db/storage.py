@@ -0,0 +1,211 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from copy import deepcopy
+from typing import Any, AsyncIterator, Dict, Optional
+
+from agno.storage.postgres import PostgresStorage
+from agno.storage.session import Session
+from agno.storage.session.agent import AgentSession
+from agno.storage.session.team import TeamSession
+from agno.storage.session.workflow import WorkflowSession
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.inspection import inspect
+from sqlalchemy.schema import MetaData
+from sqlalchemy.sql.expression import select
+
+from db.session import db_async_engine
+from utils.log import logger
+
+# True while the current task runs inside async_storage_io()
+_async_storage_io: ContextVar[bool] = ContextVar("async_storage_io", default=False)
+
+SESSION_CLASSES = {
+    "agent": AgentSession,
+    "team": TeamSession,
+    "workflow": WorkflowSession,
+}
+
+
+class AsyncPostgresStorage(PostgresStorage):
+    """
+    PostgresStorage that moves session I/O onto the async engine inside `async_storage_io()`.
+
+    Agno calls read() and upsert() synchronously from Agent.arun() and Team.arun().
+    Inside `async_storage_io()`, reads are served from a session prefetched with the async engine
+    and upserts are written behind in a task on the event loop, so neither blocks the loop.
+    Outside of it, this class behaves exactly like PostgresStorage.
+    """
+
+    def __init__(self, *args: Any, async_engine: Optional[AsyncEngine] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.async_engine: AsyncEngine = async_engine or db_async_engine
+        self.AsyncSession: async_sessionmaker[AsyncSession] = async_sessionmaker(
+            bind=self.async_engine, expire_on_commit=False
+        )
+        # Sessions loaded by aprefetch(), keyed by session_id. None means "known not to exist".
+        self._prefetched: Dict[str, Optional[Session]] = {}
+        # The latest write-behind task per session_id
+        self._pending_writes: Dict[str, asyncio.Task] = {}
+
+    def _session_from_row(self, row: Any) -> Optional[Session]:
+        if row is None:
+            return None
+        return SESSION_CLASSES[self.mode].from_dict(row._mapping)  # type: ignore
+
+    async def aread(self, session_id: str, user_id: Optional[str] = None) -> Optional[Session]:
+        """Read a Session from the database using the async engine."""
+        if self.mode not in SESSION_CLASSES:
+            return await asyncio.to_thread(PostgresStorage.read, self, session_id, user_id)
+
+        stmt = select(self.table).where(self.table.c.session_id == session_id)
+        if user_id:
+            stmt = stmt.where(self.table.c.user_id == user_id)
+        try:
+            async with self.AsyncSession() as sess:
+                result = await sess.execute(stmt)
+                return self._session_from_row(result.fetchone())
+        except Exception as e:
+            # The table may not exist yet, the sync path knows how to create it
+            logger.debug(f"Async read from {self.table.name} failed, falling back to sync read: {e}")
+            return await asyncio.to_thread(PostgresStorage.read, self, session_id, user_id)
+
+    async def aupsert(self, session: Session) -> Optional[Session]:
+        """Insert or update a Session in the database using the async engine."""
+        if self.mode not in ("agent", "team"):
+            return await asyncio.to_thread(PostgresStorage.upsert, self, session)
+
+        if self.auto_upgrade_schema and not self._schema_up_to_date:
+            await asyncio.to_thread(self.upgrade_schema)
+
+        values: Dict[str, Any] = {
+            "user_id": session.user_id,
+            "team_session_id": session.team_session_id,  # type: ignore
+            "memory": getattr(session, "memory", None),
+            "session_data": session.session_data,
+            "extra_data": session.extra_data,
+        }
+        if self.mode == "agent":
+            values.update(agent_id=session.agent_id, agent_data=session.agent_data)  # type: ignore
+        else:
+            values.update(team_id=session.team_id, team_data=session.team_data)  # type: ignore
+
+        stmt = postgresql.insert(self.table).values(session_id=session.session_id, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["session_id"], set_=dict(values, updated_at=int(time.time()))
+        )
+        try:
+            async with self.AsyncSession() as sess, sess.begin():
+                await sess.execute(stmt)
+        except Exception as e:
+            # The table may not exist yet, the sync path knows how to create it and retry
+            logger.debug(f"Async upsert into {self.table.name} failed, falling back to sync upsert: {e}")
+            return await asyncio.to_thread(PostgresStorage.upsert, self, session)
+        return session
+
+    async def aprefetch(self, session_id: str, user_id: Optional[str] = None) -> Optional[Session]:
+        """Load a Session with the async engine so the next read() inside async_storage_io() does not block."""
+        session = await self.aread(session_id=session_id, user_id=user_id)
+        self._prefetched[session_id] = session
+        return session
+
+    async def aflush(self, session_id: Optional[str] = None) -> None:
+        """Wait for pending write-behind tasks, for one session or for all of them."""
+        if session_id is not None:
+            task = self._pending_writes.get(session_id)
+            tasks = [task] if task is not None else []
+        else:
+            tasks = list(self._pending_writes.values())
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _write_after(self, previous: Optional[asyncio.Task], session: Session) -> Optional[Session]:
+        # Keep writes for the same session in order
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        try:
+            return await self.aupsert(session)
+        except Exception as e:
+            logger.warning(f"Write-behind upsert into {self.table.name} failed: {e}")
+            return None
+
+    def read(self, session_id: str, user_id: Optional[str] = None) -> Optional[Session]:
+        if _async_storage_io.get() and session_id in self._prefetched:
+            return self._prefetched[session_id]
+        return super().read(session_id=session_id, user_id=user_id)
+
+    def upsert(self, session: Session, create_and_retry: bool = True) -> Optional[Session]:
+        if not _async_storage_io.get():
+            return super().upsert(session, create_and_retry=create_and_retry)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Called from a worker thread, there is no loop to write behind on
+            return super().upsert(session, create_and_retry=create_and_retry)
+
+        now = int(time.time())
+        if session.created_at is None:
+            session.created_at = now
+        session.updated_at = now
+
+        session_id = session.session_id
+        task = loop.create_task(self._write_after(self._pending_writes.get(session_id), session))
+        self._pending_writes[session_id] = task
+        task.add_done_callback(
+            lambda t: self._pending_writes.pop(session_id) if self._pending_writes.get(session_id) is t else None
+        )
+        # Later reads in this run see the session that is being written
+        self._prefetched[session_id] = session
+        return session
+
+    def __deepcopy__(self, memo):
+        """Deep copy the storage, sharing the engines and starting with no prefetched or pending sessions."""
+        cls = self.__class__
+        copied_obj = cls.__new__(cls)
+        memo[id(self)] = copied_obj
+
+        for k, v in self.__dict__.items():
+            if k in {"metadata", "table", "inspector", "_prefetched", "_pending_writes"}:
+                continue
+            elif k in {"db_engine", "Session", "async_engine", "AsyncSession"}:
+                setattr(copied_obj, k, v)
+            else:
+                setattr(copied_obj, k, deepcopy(v, memo))
+
+        copied_obj._prefetched = {}
+        copied_obj._pending_writes = {}
+        copied_obj.metadata = MetaData(schema=copied_obj.schema)
+        copied_obj.inspector = inspect(copied_obj.db_engine)
+        copied_obj.table = copied_obj.get_table()
+        return copied_obj
+
+
+@asynccontextmanager
+async def async_storage_io(storage: Any, session_id: Optional[str] = None) -> AsyncIterator[None]:
+    """
+    Route the storage I/O of the enclosed Agent or Team run through the async engine.
+
+    Args:
+        storage: The storage of the Agent or Team, other storage types are left untouched
+        session_id: The session the run will use, prefetched before the run starts
+    """
+    if not isinstance(storage, AsyncPostgresStorage):
+        yield
+        return
+
+    token = _async_storage_io.set(True)
+    try:
+        if session_id is not None:
+            await storage.aprefetch(session_id)
+        yield
+    finally:
+        if session_id is not None:
+            await storage.aflush(session_id)
+            storage._prefetched.pop(session_id, None)
+        try:
+            _async_storage_io.reset(token)
+        except ValueError:
+            # A streaming response was closed from another context, e.g. on client disconnect
+            _async_storage_io.set(False)
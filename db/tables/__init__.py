@@ -1 +1,3 @@
 from db.tables.base import Base
+from db.tables.cache import CacheEntry
+from db.tables.knowledge import EmbeddingCacheEntry, KnowledgeDocument
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.tables.base import Base
+
+
+class CacheEntry(Base):
+    """A value in the shared cache, see db/cache.py"""
+
+    __tablename__ = "cache_entries"
+
+    namespace: Mapped[str] = mapped_column(String(128), primary_key=True)
+    key: Mapped[str] = mapped_column(Text, primary_key=True)
+    value: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_accessed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    hits: Mapped[int] = mapped_column(Integer, server_default="0", nullable=False)
+
+    __table_args__ = (
+        Index("ix_cache_entries_namespace_last_accessed_at", "namespace", "last_accessed_at"),
+        Index("ix_cache_entries_expires_at", "expires_at"),
+    )
@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import DateTime, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, REAL
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.tables.base import Base
+
+
+class KnowledgeDocument(Base):
+    """A document ingested into a knowledge base table and the hashes of its chunks, see knowledge/dedup.py"""
+
+    __tablename__ = "knowledge_documents"
+
+    # Full name of the PgVector table, e.g. "ai.sage_knowledge"
+    knowledge_table: Mapped[str] = mapped_column(String(256), primary_key=True)
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    # sha256 of the uploaded file, or of the chunk hashes for sources that are not files
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    # Ids of the document's chunks in the knowledge base table, which are the md5 of their content
+    chunk_hashes: Mapped[List[str]] = mapped_column(JSONB, nullable=False)
+    chunks: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (Index("ix_knowledge_documents_knowledge_table_content_hash", "knowledge_table", "content_hash"),)
+
+
+class EmbeddingCacheEntry(Base):
+    """An embedding of a text by an embedder model, see knowledge/embeddings.py"""
+
+    __tablename__ = "embedding_cache"
+
+    # Embedder model id and dimensions, e.g. "text-embedding-3-small:1536"
+    model: Mapped[str] = mapped_column(String(128), primary_key=True)
+    # sha256 of the embedded text
+    text_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    embedding: Mapped[List[float]] = mapped_column(ARRAY(REAL), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,109 @@
+import hashlib
+from threading import Lock
+from typing import Iterable, List, Optional, Set
+
+from agno.vectordb.pgvector import PgVector
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Engine
+
+from db.session import db_engine
+from db.tables.knowledge import KnowledgeDocument
+
+######################################################
+## Content hashes of the documents and chunks in knowledge bases
+######################################################
+
+_table = KnowledgeDocument.__table__
+_table_lock = Lock()
+_table_ready = False
+
+
+def _ensure_table(engine: Engine) -> None:
+    # The table is created by the alembic migration, this covers databases that were not migrated yet
+    global _table_ready
+    if _table_ready:
+        return
+    with _table_lock:
+        if not _table_ready:
+            _table.create(engine, checkfirst=True)
+            _table_ready = True
+
+
+def hash_content(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def hash_chunk_hashes(chunk_hashes: Iterable[str]) -> str:
+    """The content hash of a document that is not a file, e.g. a website, from the hashes of its chunks."""
+    return hash_content("\n".join(sorted(set(chunk_hashes))).encode())
+
+
+def find_document(knowledge_table: str, content_hash: str, engine: Engine = db_engine) -> Optional[str]:
+    """Returns the name of a document with this content hash in the knowledge base, if there is one."""
+    _ensure_table(engine)
+    stmt = select(_table.c.name).where(
+        _table.c.knowledge_table == knowledge_table, _table.c.content_hash == content_hash
+    )
+    with engine.connect() as conn:
+        return conn.execute(stmt.limit(1)).scalar_one_or_none()
+
+
+def get_chunk_hashes(knowledge_table: str, name: str, engine: Engine = db_engine) -> Set[str]:
+    """Returns the chunk hashes stored for the document with this name when it was last ingested."""
+    _ensure_table(engine)
+    stmt = select(_table.c.chunk_hashes).where(_table.c.knowledge_table == knowledge_table, _table.c.name == name)
+    with engine.connect() as conn:
+        return set(conn.execute(stmt).scalar_one_or_none() or [])
+
+
+def save_document(
+    knowledge_table: str, name: str, content_hash: str, chunk_hashes: List[str], engine: Engine = db_engine
+) -> None:
+    _ensure_table(engine)
+    values = {"content_hash": content_hash, "chunk_hashes": chunk_hashes, "chunks": len(chunk_hashes)}
+    stmt = postgresql.insert(_table).values(knowledge_table=knowledge_table, name=name, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["knowledge_table", "name"], set_={**values, "updated_at": func.now()}
+    )
+    with engine.begin() as conn:
+        conn.execute(stmt)
+
+
+def get_existing_chunk_ids(vector_db: PgVector, ids: List[str]) -> Set[str]:
+    """Returns which of the chunk ids are already stored in the knowledge base table."""
+    if not ids:
+        return set()
+    stmt = select(vector_db.table.c.id).where(vector_db.table.c.id.in_(ids))
+    with vector_db.Session() as sess:
+        return set(sess.execute(stmt).scalars())
+
+
+def delete_stale_chunks(vector_db: PgVector, name: str, stale: Set[str], engine: Engine = db_engine) -> int:
+    """
+    Delete chunks that an updated document no longer contains, unless another document still contains them.
+
+    Returns:
+        int: The number of chunks deleted.
+    """
+    if not stale:
+        return 0
+    elements = (
+        select(func.jsonb_array_elements_text(_table.c.chunk_hashes).label("chunk_hash"))
+        .where(_table.c.knowledge_table == vector_db.table.fullname, _table.c.name != name)
+        .subquery()
+    )
+    shared = select(elements.c.chunk_hash).where(elements.c.chunk_hash.in_(list(stale))).distinct()
+    with engine.connect() as conn:
+        stale = stale - set(conn.execute(shared).scalars())
+    if not stale:
+        return 0
+    with vector_db.Session() as sess, sess.begin():
+        return sess.execute(delete(vector_db.table).where(vector_db.table.c.id.in_(list(stale)))).rowcount
+
+
+def forget_documents(knowledge_table: str, engine: Engine = db_engine) -> None:
+    """Forget every document of a knowledge base, e.g. after its table was emptied."""
+    _ensure_table(engine)
+    with engine.begin() as conn:
+        conn.execute(delete(_table).where(_table.c.knowledge_table == knowledge_table))
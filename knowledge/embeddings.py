@@ -0,0 +1,143 @@
+import hashlib
+from array import array
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from agno.embedder.openai import OpenAIEmbedder
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from db.cache import MemoryCache
+from db.session import db_engine
+from db.tables.knowledge import EmbeddingCacheEntry
+from knowledge.settings import knowledge_settings
+from utils.log import logger
+
+######################################################
+## Embeddings cached by embedder model and text hash
+######################################################
+
+_table = EmbeddingCacheEntry.__table__
+_table_lock = Lock()
+_table_ready = False
+
+# Most recently used embeddings of this process, in front of the embedding_cache table. They are kept as float32
+# arrays, a list of Python floats takes about 8 times the memory, and the table stores them as float32 as well
+embedding_lru = MemoryCache(
+    "embeddings",
+    ttl=knowledge_settings.embedding_cache_lru_ttl,
+    max_entries=knowledge_settings.embedding_cache_lru_size,
+)
+
+_metrics_lock = Lock()
+_metrics: Dict[str, int] = {"memory_hits": 0, "db_hits": 0, "misses": 0, "errors": 0}
+
+
+def _ensure_table() -> None:
+    # The table is created by the alembic migration, this covers databases that were not migrated yet
+    global _table_ready
+    if _table_ready:
+        return
+    with _table_lock:
+        if not _table_ready:
+            _table.create(db_engine, checkfirst=True)
+            _table_ready = True
+
+
+def _count(**counters: int) -> None:
+    with _metrics_lock:
+        for counter, n in counters.items():
+            _metrics[counter] += n
+
+
+def get_embedding_cache_metrics() -> Dict[str, Any]:
+    """Returns the embedding cache hit rate of this process, memory and database hits count as hits."""
+    with _metrics_lock:
+        hits = _metrics["memory_hits"] + _metrics["db_hits"]
+        lookups = hits + _metrics["misses"]
+        return {**_metrics, "hit_rate": round(hits / lookups, 4) if lookups else None}
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", errors="replace")).hexdigest()
+
+
+@dataclass
+class CachedOpenAIEmbedder(OpenAIEmbedder):
+    """
+    OpenAIEmbedder backed by the embedding cache.
+
+    Embeddings are looked up by (model, sha256 of the text) in an in-memory LRU and then in the
+    shared embedding_cache table, so a text is only sent to the embeddings API once per model.
+    Database errors are logged and treated as misses.
+    """
+
+    @property
+    def model_key(self) -> str:
+        # Different dimensions of the same model are different embeddings
+        return f"{self.id}:{self.dimensions}"
+
+    def _load(self, hashes: List[str]) -> Dict[str, List[float]]:
+        stmt = select(_table.c.text_hash, _table.c.embedding).where(
+            _table.c.model == self.model_key, _table.c.text_hash.in_(hashes)
+        )
+        try:
+            _ensure_table()
+            with db_engine.connect() as conn:
+                return {text_hash: list(embedding) for text_hash, embedding in conn.execute(stmt)}
+        except Exception as e:
+            logger.warning(f"Could not read embedding cache: {e}")
+            _count(errors=1)
+            return {}
+
+    def _save(self, embeddings: Dict[str, List[float]]) -> None:
+        rows = [
+            {"model": self.model_key, "text_hash": text_hash, "embedding": embedding}
+            for text_hash, embedding in embeddings.items()
+        ]
+        try:
+            _ensure_table()
+            with db_engine.begin() as conn:
+                conn.execute(postgresql.insert(_table).values(rows).on_conflict_do_nothing())
+        except Exception as e:
+            logger.warning(f"Could not write embedding cache: {e}")
+            _count(errors=1)
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Returns the embeddings of texts, embedding the ones that are not cached with a single request."""
+        hashes = [hash_text(text) for text in texts]
+        texts_by_hash = dict(zip(hashes, texts))
+        embeddings: Dict[str, List[float]] = {}
+
+        for text_hash in texts_by_hash:
+            cached: Optional[array] = embedding_lru.get(f"{self.model_key}:{text_hash}")
+            if cached is not None:
+                embeddings[text_hash] = cached.tolist()
+        memory_hits = len(embeddings)
+
+        missing = [text_hash for text_hash in texts_by_hash if text_hash not in embeddings]
+        loaded = self._load(missing) if missing else {}
+        embeddings.update(loaded)
+
+        missing = [text_hash for text_hash in missing if text_hash not in loaded]
+        created: Dict[str, List[float]] = {}
+        if missing:
+            # The embeddings endpoint takes a list of inputs, their order is kept by `index`
+            response = self.response(text=[texts_by_hash[text_hash] for text_hash in missing])  # type: ignore[arg-type]
+            for data in response.data:
+                created[missing[data.index]] = data.embedding
+            self._save(created)
+            embeddings.update(created)
+
+        for text_hash in {**loaded, **created}:
+            embedding_lru.set(f"{self.model_key}:{text_hash}", array("f", embeddings[text_hash]))
+        _count(memory_hits=memory_hits, db_hits=len(loaded), misses=len(created))
+        return [embeddings[text_hash] for text_hash in hashes]
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.get_embeddings([text])[0]
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        # Usage is only known for texts that were not cached, it is not tracked per text
+        return self.get_embedding(text), None
@@ -0,0 +1,336 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import uuid4
+
+from agno.document import Document
+from agno.document.reader import Reader
+from agno.document.reader.csv_reader import CSVReader
+from agno.document.reader.docx_reader import DocxReader
+from agno.document.reader.pdf_reader import PDFReader
+from agno.document.reader.text_reader import TextReader
+from agno.embedder import Embedder
+from agno.embedder.openai import OpenAIEmbedder
+from agno.utils.string import safe_content_hash
+from agno.vectordb.pgvector import PgVector
+from pypdf import PdfReader
+from sqlalchemy.dialects import postgresql
+
+from knowledge.dedup import (
+    delete_stale_chunks,
+    find_document,
+    get_chunk_hashes,
+    get_existing_chunk_ids,
+    hash_chunk_hashes,
+    hash_content,
+    save_document,
+)
+from knowledge.embeddings import CachedOpenAIEmbedder
+from knowledge.settings import knowledge_settings
+from knowledge.vector_index import TunedPgVector
+from utils.log import logger
+
+######################################################
+## Background, batched ingestion into PgVector knowledge bases
+######################################################
+
+
+@dataclass
+class IngestionJob:
+    """Progress of one document being ingested. Read it from any thread, only the pipeline updates it."""
+
+    name: str
+    job_id: str = field(default_factory=lambda: str(uuid4()))
+    # sha256 of the uploaded file
+    content_hash: Optional[str] = None
+    # queued, reading, indexing, done or failed
+    status: str = "queued"
+    # Pages of a PDF, or documents returned by other readers
+    total_parts: Optional[int] = None
+    parts_read: int = 0
+    chunks_stored: int = 0
+    # Chunks already in the knowledge base, which were not embedded again
+    chunks_skipped: int = 0
+    # Chunks of an earlier version of the document that this version no longer contains
+    chunks_deleted: int = 0
+    # Set when a document with the same content was ingested before, nothing is embedded then
+    duplicate_of: Optional[str] = None
+    error: Optional[str] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    @property
+    def progress(self) -> float:
+        """Share of the document read and stored, between 0 and 1."""
+        if self.status == "done":
+            return 1.0
+        if not self.total_parts:
+            return 0.0
+        return min(self.parts_read / self.total_parts, 0.99)
+
+
+def get_reader(file_name: str) -> Optional[Reader]:
+    """Returns the reader for a file by its extension, or None if the type is not supported."""
+    file_type = file_name.split(".")[-1].lower()
+    if file_type == "pdf":
+        return PDFReader()
+    if file_type == "csv":
+        return CSVReader()
+    if file_type == "txt":
+        return TextReader()
+    if file_type == "docx":
+        return DocxReader()
+    return None
+
+
+def iter_chunks(reader: Reader, source: Any, name: str, job: IngestionJob) -> Iterator[Document]:
+    """
+    Yield the chunks of a document as they are read.
+
+    PDFs are read page by page, so the first chunks are stored before the last page is parsed.
+    Other readers return the whole document at once.
+    """
+    if isinstance(reader, PDFReader):
+        pdf = PdfReader(source)
+        if pdf.is_encrypted and not (reader.password and pdf.decrypt(reader.password)):
+            raise ValueError(f"{name} is password protected")
+        job.total_parts = len(pdf.pages)
+        for page_number, page in enumerate(pdf.pages, start=1):
+            document = Document(
+                name=name, id=f"{name}_{page_number}", meta_data={"page": page_number}, content=page.extract_text()
+            )
+            yield from reader.chunk_document(document) if reader.chunk else [document]
+            job.parts_read += 1
+    else:
+        documents = reader.read(source)
+        job.total_parts = len(documents)
+        for document in documents:
+            yield document
+            job.parts_read += 1
+
+
+def embed_batch(embedder: Embedder, texts: List[str]) -> List[List[float]]:
+    """Embed texts with one request when the embedder supports it, one request per text otherwise."""
+    if isinstance(embedder, CachedOpenAIEmbedder):
+        return embedder.get_embeddings(texts)
+    if isinstance(embedder, OpenAIEmbedder):
+        # The embeddings endpoint takes a list of inputs, their order is kept by `index`
+        response = embedder.response(text=texts)  # type: ignore[arg-type]
+        return [data.embedding for data in sorted(response.data, key=lambda data: data.index)]
+    return [embedder.get_embedding(text) for text in texts]
+
+
+def upsert_chunks(vector_db: PgVector, chunks: List[Document], filters: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Embed and upsert a batch of chunks with one embedder request and one statement, in PgVector's format.
+
+    Returns:
+        int: The number of chunks stored, empty chunks are skipped.
+    """
+    chunks = [chunk for chunk in chunks if chunk.content and chunk.content.strip()]
+    if not chunks:
+        return 0
+    embeddings = embed_batch(vector_db.embedder, [chunk.content for chunk in chunks])
+    records: Dict[str, Dict[str, Any]] = {}
+    for chunk, embedding in zip(chunks, embeddings):
+        content_hash = safe_content_hash(chunk.content)
+        # Like PgVector.upsert, the content hash is the id, so identical chunks are stored once
+        records[content_hash] = {
+            "id": content_hash,
+            "name": chunk.name,
+            "meta_data": {**(chunk.meta_data or {}), **(filters or {})},
+            "filters": filters,
+            "content": chunk.content.replace("\x00", "\ufffd"),
+            "embedding": embedding,
+            "usage": None,
+            "content_hash": content_hash,
+        }
+    stmt = postgresql.insert(vector_db.table).values(list(records.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["id"],
+        set_={
+            column: stmt.excluded[column]
+            for column in ("name", "meta_data", "filters", "content", "embedding", "usage", "content_hash")
+        },
+    )
+    with vector_db.Session() as sess, sess.begin():
+        sess.execute(stmt)
+    return len(chunks)
+
+
+class IngestionPipeline:
+    """
+    Ingest documents into PgVector knowledge bases in background threads.
+
+    Chunks are streamed out of the reader, embedded `batch_size` at a time and
+    bulk-upserted, while callers poll the returned IngestionJob for progress.
+
+    Documents whose content was ingested before are skipped, and only chunks that are not
+    in the knowledge base yet are embedded, so re-ingesting an edited document only embeds
+    its changed chunks. Chunks the new version no longer contains are deleted.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = knowledge_settings.ingestion_batch_size,
+        max_workers: int = knowledge_settings.ingestion_max_workers,
+    ):
+        self.batch_size = batch_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingestion")
+        self._lock = Lock()
+        self._jobs: Dict[str, IngestionJob] = {}
+        self.documents_skipped = 0
+        self.chunks_embedded = 0
+        self.chunks_skipped = 0
+        self.chunks_deleted = 0
+
+    def submit(
+        self,
+        name: str,
+        reader: Reader,
+        source: Any,
+        vector_db: PgVector,
+        filters: Optional[Dict[str, Any]] = None,
+        content_hash: Optional[str] = None,
+    ) -> IngestionJob:
+        """
+        Queue a document for ingestion and return its job right away.
+
+        Args:
+            name: The document name stored with its chunks
+            reader: The reader for the document
+            source: What reader reads, a file-like object must stay readable after the caller returns
+            vector_db: The knowledge base table to store the chunks in
+            filters: Filters stored with every chunk
+            content_hash: sha256 of the document, computed here for in-memory files
+        """
+        if content_hash is None and hasattr(source, "getvalue"):
+            content_hash = hash_content(source.getvalue())
+        job = IngestionJob(name=name, content_hash=content_hash)
+        with self._lock:
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job, reader, source, vector_db, filters)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[IngestionJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _count(self, **counters: int) -> None:
+        with self._lock:
+            for counter, n in counters.items():
+                setattr(self, counter, getattr(self, counter) + n)
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Returns the deduplication counters of this process."""
+        with self._lock:
+            return {
+                "documents_skipped": self.documents_skipped,
+                "chunks_embedded": self.chunks_embedded,
+                "embeddings_avoided": self.chunks_skipped,
+                "chunks_deleted": self.chunks_deleted,
+            }
+
+    def _store_batch(
+        self,
+        job: IngestionJob,
+        vector_db: PgVector,
+        batch: List[Document],
+        chunk_hashes: List[str],
+        filters: Optional[Dict[str, Any]],
+    ) -> None:
+        batch = [chunk for chunk in batch if chunk.content and chunk.content.strip()]
+        hashes = [safe_content_hash(chunk.content) for chunk in batch]
+        chunk_hashes.extend(hashes)
+        # Chunks are stored under their content hash, so a stored id means the chunk needs no embedding
+        seen = get_existing_chunk_ids(vector_db, hashes)
+        new_chunks: List[Document] = []
+        for chunk, chunk_hash in zip(batch, hashes):
+            if chunk_hash not in seen:
+                seen.add(chunk_hash)
+                new_chunks.append(chunk)
+        stored = upsert_chunks(vector_db, new_chunks, filters=filters)
+        job.chunks_stored += stored
+        job.chunks_skipped += len(batch) - len(new_chunks)
+        self._count(chunks_embedded=stored, chunks_skipped=len(batch) - len(new_chunks))
+
+    def _update_index(self, job: IngestionJob, vector_db: TunedPgVector) -> None:
+        # The chunks are stored and searchable already, a failed index build only makes searches slower
+        try:
+            index_update = vector_db.after_bulk_load(job.chunks_stored)
+            if index_update is not None:
+                logger.info(f"Vector index of {vector_db.table.fullname} {index_update} after ingesting {job.name}")
+        except Exception as e:
+            logger.warning(f"Could not update the vector index of {vector_db.table.fullname}: {e}")
+
+    def _save_alias(self, job: IngestionJob, vector_db: PgVector) -> None:
+        # Record the duplicate under its own name with the chunks of the stored document, so updating or deleting
+        # either of them later keeps the chunks the other still contains
+        knowledge_table = vector_db.table.fullname
+        previous_hashes = get_chunk_hashes(knowledge_table, job.name)
+        chunk_hashes = get_chunk_hashes(knowledge_table, job.duplicate_of)
+        save_document(knowledge_table, job.name, job.content_hash, sorted(chunk_hashes))
+        job.chunks_deleted = delete_stale_chunks(vector_db, job.name, previous_hashes - chunk_hashes)
+        self._count(chunks_deleted=job.chunks_deleted)
+
+    def _run(
+        self, job: IngestionJob, reader: Reader, source: Any, vector_db: PgVector, filters: Optional[Dict[str, Any]]
+    ) -> None:
+        job.status = "reading"
+        job.started_at = time.time()
+        knowledge_table = vector_db.table.fullname
+        try:
+            vector_db.create()
+            if job.content_hash is not None:
+                job.duplicate_of = find_document(knowledge_table, job.content_hash)
+                if job.duplicate_of is not None:
+                    logger.info(f"Skipping {job.name}, it has the same content as {job.duplicate_of}")
+                    if job.duplicate_of != job.name:
+                        self._save_alias(job, vector_db)
+                    self._count(documents_skipped=1)
+                    job.status = "done"
+                    return
+
+            previous_hashes = get_chunk_hashes(knowledge_table, job.name)
+            chunk_hashes: List[str] = []
+            batch: List[Document] = []
+            for chunk in iter_chunks(reader, source, job.name, job):
+                batch.append(chunk)
+                if len(batch) >= self.batch_size:
+                    self._store_batch(job, vector_db, batch, chunk_hashes, filters)
+                    batch = []
+            if batch:
+                self._store_batch(job, vector_db, batch, chunk_hashes, filters)
+
+            job.chunks_deleted = delete_stale_chunks(vector_db, job.name, previous_hashes - set(chunk_hashes))
+            self._count(chunks_deleted=job.chunks_deleted)
+            save_document(
+                knowledge_table,
+                job.name,
+                job.content_hash or hash_chunk_hashes(chunk_hashes),
+                list(dict.fromkeys(chunk_hashes)),
+            )
+            if isinstance(vector_db, TunedPgVector) and job.chunks_stored > 0:
+                job.status = "indexing"
+                self._update_index(job, vector_db)
+            job.status = "done"
+            logger.info(
+                f"Ingested {job.name} in {time.time() - job.started_at:.1f}s: {job.chunks_stored} chunks embedded, "
+                f"{job.chunks_skipped} unchanged, {job.chunks_deleted} deleted"
+            )
+        except Exception as e:
+            logger.error(f"Could not ingest {job.name}: {e}")
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+
+
+# One per process, so Streamlit reruns and sessions share the workers
+ingestion_pipeline = IngestionPipeline()
@@ -0,0 +1,51 @@
+from typing import Literal, Optional
+
+from pydantic_settings import BaseSettings
+
+
+class KnowledgeSettings(BaseSettings):
+    """Knowledge base settings that can be set using environment variables.
+
+    Reference: https://pydantic-docs.helpmanual.io/usage/settings/
+    """
+
+    # Chunks embedded per embedder request and inserted per statement
+    ingestion_batch_size: int = 100
+    # Documents ingested at the same time, further uploads wait in a queue
+    ingestion_max_workers: int = 2
+
+    # Embeddings kept in memory per process in front of the embedding_cache table, as float32 arrays they take
+    # 4 bytes per dimension, about 6KiB each for 1536 dimensions
+    embedding_cache_lru_size: int = 5000
+    embedding_cache_lru_ttl: int = 7 * 24 * 60 * 60
+
+    # ANN index of knowledge base tables, see knowledge/vector_index.py
+    vector_index_type: Literal["hnsw", "ivfflat"] = "hnsw"
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 64
+    # Candidates searched per query, at least the number of results wanted. Can be set per request.
+    hnsw_ef_search: int = 40
+    # None picks rows / 1000 lists below 1M rows and sqrt(rows) above
+    ivfflat_lists: Optional[int] = None
+    # Lists searched per query. Can be set per request.
+    ivfflat_probes: int = 10
+    # Below this many rows a sequential scan is exact and fast enough, no index is built
+    vector_index_min_rows: int = 1000
+    # Rebuild the index after a bulk load that grows the table by this share
+    vector_index_rebuild_ratio: float = 0.2
+    maintenance_work_mem: str = "1GB"
+
+    # Postgres text search configuration of the generated content_tsv column of knowledge base tables
+    text_search_config: str = "english"
+    # How hybrid search combines vector and keyword results:
+    # "rrf" fuses their ranks (reciprocal rank fusion), "linear" is PgVector's weighted sum of the scores
+    hybrid_fusion: Literal["rrf", "linear"] = "rrf"
+    rrf_k: int = 60
+    rrf_vector_weight: float = 1.0
+    rrf_keyword_weight: float = 1.0
+    # Results taken from vector and from keyword search before fusing them
+    hybrid_candidates: int = 40
+
+
+# Create a KnowledgeSettings object
+knowledge_settings = KnowledgeSettings()
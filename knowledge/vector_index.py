@@ -0,0 +1,367 @@
+import re
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from copy import copy
+from math import sqrt
+from typing import Any, Dict, Iterator, List, Optional, Set, Union
+
+from agno.document import Document
+from agno.vectordb.distance import Distance
+from agno.vectordb.pgvector import PgVector
+from agno.vectordb.pgvector.index import HNSW, Ivfflat
+from sqlalchemy import Column, Computed, Index, Row, Select, bindparam, func, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from knowledge.settings import knowledge_settings
+from utils.log import logger
+
+######################################################
+## ANN and full-text indexes of PgVector tables, and query-time tuning
+######################################################
+
+# Generated tsvector column of the content, with a GIN index
+TEXT_SEARCH_COLUMN = "content_tsv"
+
+# Query-time overrides of the index settings for the current request
+_ef_search: ContextVar[Optional[int]] = ContextVar("ef_search", default=None)
+_probes: ContextVar[Optional[int]] = ContextVar("probes", default=None)
+
+# Tables whose content_tsv column is known to match the text search config, checked once per process
+_text_search_tables: Set[str] = set()
+# Tables without it, warned about once per process
+_text_search_missing: Set[str] = set()
+
+_OPERATOR_CLASSES = {
+    Distance.cosine: "vector_cosine_ops",
+    Distance.l2: "vector_l2_ops",
+    Distance.max_inner_product: "vector_ip_ops",
+}
+
+
+@contextmanager
+def search_params(ef_search: Optional[int] = None, probes: Optional[int] = None) -> Iterator[None]:
+    """Use these HNSW ef_search / IVFFlat probes for every TunedPgVector search in this context."""
+    ef_search_token = _ef_search.set(ef_search)
+    probes_token = _probes.set(probes)
+    try:
+        yield
+    finally:
+        _probes.reset(probes_token)
+        _ef_search.reset(ef_search_token)
+
+
+def get_vector_index() -> Union[HNSW, Ivfflat]:
+    """Returns the index configured in knowledge_settings."""
+    configuration = {"maintenance_work_mem": knowledge_settings.maintenance_work_mem}
+    if knowledge_settings.vector_index_type == "ivfflat":
+        return Ivfflat(
+            lists=knowledge_settings.ivfflat_lists or 100,
+            dynamic_lists=knowledge_settings.ivfflat_lists is None,
+            probes=knowledge_settings.ivfflat_probes,
+            configuration=configuration,
+        )
+    return HNSW(
+        m=knowledge_settings.hnsw_m,
+        ef_construction=knowledge_settings.hnsw_ef_construction,
+        ef_search=knowledge_settings.hnsw_ef_search,
+        configuration=configuration,
+    )
+
+
+class TunedPgVector(PgVector):
+    """
+    PgVector that manages its ANN and full-text indexes and takes ef_search / probes per request.
+
+    The ANN index is created once the table holds `vector_index_min_rows` rows and rebuilt without
+    blocking searches after bulk loads that grow the table by `vector_index_rebuild_ratio`.
+    Wrap searches in `search_params(...)` to override the index's query-time settings.
+
+    Keyword search uses a generated content_tsv column with a GIN index instead of computing
+    to_tsvector for every row. New tables are created with them, existing tables get them from the
+    alembic migration and are searched like PgVector does until then. Hybrid search fuses the top
+    vector and keyword results with weighted reciprocal rank fusion, or uses PgVector's weighted
+    scores with `hybrid_fusion="linear"`.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        hybrid_fusion: Optional[str] = None,
+        rrf_k: Optional[int] = None,
+        rrf_vector_weight: Optional[float] = None,
+        rrf_keyword_weight: Optional[float] = None,
+        hybrid_candidates: Optional[int] = None,
+        **kwargs: Any,
+    ):
+        kwargs.setdefault("vector_index", get_vector_index())
+        kwargs.setdefault("content_language", knowledge_settings.text_search_config)
+        super().__init__(*args, **kwargs)
+        if self.vector_index.name is None:
+            index_type = "ivfflat" if isinstance(self.vector_index, Ivfflat) else "hnsw"
+            self.vector_index.name = f"{self.table_name}_{index_type}_index"
+        if not re.fullmatch(r"\w+", self.content_language):
+            raise ValueError(f"Invalid text search config: {self.content_language}")
+
+        self.hybrid_fusion = hybrid_fusion or knowledge_settings.hybrid_fusion
+        self.rrf_k = rrf_k if rrf_k is not None else knowledge_settings.rrf_k
+        self.rrf_vector_weight = (
+            rrf_vector_weight if rrf_vector_weight is not None else knowledge_settings.rrf_vector_weight
+        )
+        self.rrf_keyword_weight = (
+            rrf_keyword_weight if rrf_keyword_weight is not None else knowledge_settings.rrf_keyword_weight
+        )
+        self.hybrid_candidates = hybrid_candidates or knowledge_settings.hybrid_candidates
+
+        self._add_text_search_column()
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "TunedPgVector":
+        # PgVector rebuilds the table of the copy without the column
+        copied = super().__deepcopy__(memo)
+        copied._add_text_search_column()
+        return copied
+
+    def _add_text_search_column(self) -> None:
+        # New tables are created with the column and its index, existing ones get them from the migration
+        self.table.append_column(
+            Column(TEXT_SEARCH_COLUMN, TSVECTOR, Computed(self._text_search_expression(), persisted=True))
+        )
+        Index(self.text_search_index_name, self.table.c[TEXT_SEARCH_COLUMN], postgresql_using="gin")
+
+    @property
+    def text_search_index_name(self) -> str:
+        return f"{self.table_name}_{TEXT_SEARCH_COLUMN}_index"
+
+    def _text_search_expression(self) -> str:
+        return f"to_tsvector('{self.content_language}'::regconfig, coalesce(content, ''))"
+
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        update: Dict[str, int] = {}
+        if isinstance(self.vector_index, HNSW) and _ef_search.get() is not None:
+            update["ef_search"] = _ef_search.get()  # type: ignore[assignment]
+        elif isinstance(self.vector_index, Ivfflat) and _probes.get() is not None:
+            update["probes"] = _probes.get()  # type: ignore[assignment]
+        if not update:
+            return super().search(query, limit=limit, filters=filters)
+        # The searches read their settings from vector_index, a copy keeps concurrent requests apart
+        tuned = copy(self)
+        tuned.vector_index = self.vector_index.model_copy(update=update)
+        return PgVector.search(tuned, query, limit=limit, filters=filters)
+
+    def drop(self) -> None:
+        super().drop()
+        _text_search_tables.discard(self.table.fullname)
+
+    def has_text_search(self) -> bool:
+        """Returns True if the table has the content_tsv column, generated with the text search config."""
+        fullname = self.table.fullname
+        if fullname in _text_search_tables:
+            return True
+        with self.Session() as sess:
+            expression = sess.execute(
+                text(
+                    "SELECT pg_get_expr(d.adbin, d.adrelid) FROM pg_attribute a "
+                    "JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum "
+                    "WHERE a.attrelid = to_regclass(:table) AND a.attname = :column AND NOT a.attisdropped"
+                ),
+                {"table": fullname, "column": TEXT_SEARCH_COLUMN},
+            ).scalar()
+        if expression is None or f"'{self.content_language}'::regconfig" not in expression:
+            if fullname not in _text_search_missing:
+                _text_search_missing.add(fullname)
+                logger.warning(
+                    f"{fullname} has no {TEXT_SEARCH_COLUMN} column for {self.content_language}, "
+                    "keyword search computes to_tsvector for every row until the migration is applied"
+                )
+            return False
+        _text_search_tables.add(fullname)
+        return True
+
+    def _ts_query(self, query: str) -> ColumnElement:
+        processed_query = self.enable_prefix_matching(query) if self.prefix_match else query
+        return func.websearch_to_tsquery(self.content_language, bindparam("query", value=processed_query))
+
+    def _keyword_statement(self, query: str, limit: int, filters: Optional[Dict[str, Any]]) -> Select:
+        content_tsv = self.table.c[TEXT_SEARCH_COLUMN]
+        ts_query = self._ts_query(query)
+        # Only matching rows are ranked, the match is answered by the GIN index
+        stmt = select(*self._result_columns()).where(content_tsv.op("@@")(ts_query))
+        if filters is not None:
+            stmt = stmt.where(self.table.c.meta_data.contains(filters))
+        return stmt.order_by(func.ts_rank_cd(content_tsv, ts_query).desc()).limit(limit)
+
+    def _vector_statement(self, query_embedding: List[float], limit: int, filters: Optional[Dict[str, Any]]) -> Select:
+        embedding = self.table.c.embedding
+        if self.distance == Distance.l2:
+            distance = embedding.l2_distance(query_embedding)
+        elif self.distance == Distance.max_inner_product:
+            distance = embedding.max_inner_product(query_embedding)
+        else:
+            distance = embedding.cosine_distance(query_embedding)
+        stmt = select(*self._result_columns())
+        if filters is not None:
+            stmt = stmt.where(self.table.c.meta_data.contains(filters))
+        return stmt.order_by(distance).limit(limit)
+
+    def _result_columns(self) -> List[Column]:
+        return [
+            self.table.c.id,
+            self.table.c.name,
+            self.table.c.meta_data,
+            self.table.c.content,
+            self.table.c.embedding,
+            self.table.c.usage,
+        ]
+
+    def _to_document(self, row: Row) -> Document:
+        return Document(
+            id=row.id,
+            name=row.name,
+            meta_data=row.meta_data,
+            content=row.content,
+            embedder=self.embedder,
+            embedding=row.embedding,
+            usage=row.usage,
+        )
+
+    def _set_search_params(self, sess: Session) -> None:
+        if isinstance(self.vector_index, Ivfflat):
+            sess.execute(text(f"SET LOCAL ivfflat.probes = {int(self.vector_index.probes)}"))
+        elif isinstance(self.vector_index, HNSW):
+            sess.execute(text(f"SET LOCAL hnsw.ef_search = {int(self.vector_index.ef_search)}"))
+
+    def keyword_search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        try:
+            if not self.has_text_search():
+                return super().keyword_search(query, limit=limit, filters=filters)
+            with self.Session() as sess, sess.begin():
+                rows = sess.execute(self._keyword_statement(query, limit, filters)).fetchall()
+        except Exception as e:
+            logger.error(f"Error during keyword search: {e}")
+            return []
+        return [self._to_document(row) for row in rows]
+
+    def hybrid_search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        try:
+            if self.hybrid_fusion != "rrf" or not self.has_text_search():
+                return super().hybrid_search(query, limit=limit, filters=filters)
+            query_embedding = self.embedder.get_embedding(query)
+            if query_embedding is None:
+                logger.error(f"Error getting embedding for Query: {query}")
+                return []
+            candidates = max(self.hybrid_candidates, limit)
+            with self.Session() as sess, sess.begin():
+                self._set_search_params(sess)
+                vector_rows = sess.execute(self._vector_statement(query_embedding, candidates, filters)).fetchall()
+                keyword_rows = sess.execute(self._keyword_statement(query, candidates, filters)).fetchall()
+        except Exception as e:
+            logger.error(f"Error during hybrid search: {e}")
+            return []
+
+        # Reciprocal rank fusion: rows ranked high by either search, or fairly high by both, come first
+        scores: Dict[str, float] = defaultdict(float)
+        rows: Dict[str, Row] = {}
+        for weight, ranked in ((self.rrf_vector_weight, vector_rows), (self.rrf_keyword_weight, keyword_rows)):
+            for rank, row in enumerate(ranked, start=1):
+                scores[row.id] += weight / (self.rrf_k + rank)
+                rows[row.id] = row
+        fused = sorted(scores, key=lambda row_id: scores[row_id], reverse=True)[:limit]
+        documents = [self._to_document(rows[row_id]) for row_id in fused]
+        if self.reranker:
+            documents = self.reranker.rerank(query=query, documents=documents)
+        return documents
+
+    def index_exists(self) -> bool:
+        return self._index_exists(self.vector_index.name)  # type: ignore[arg-type]
+
+    def _index_sql(self, name: str, rows: int) -> str:
+        operator_class = _OPERATOR_CLASSES.get(self.distance, "vector_cosine_ops")
+        if isinstance(self.vector_index, Ivfflat):
+            lists = self.vector_index.lists
+            if self.vector_index.dynamic_lists:
+                lists = max(rows // 1000, 1) if rows < 1_000_000 else int(sqrt(rows))
+            return (
+                f'CREATE INDEX CONCURRENTLY "{name}" ON {self.table.fullname} '
+                f"USING ivfflat (embedding {operator_class}) WITH (lists = {int(lists)})"
+            )
+        return (
+            f'CREATE INDEX CONCURRENTLY "{name}" ON {self.table.fullname} '
+            f"USING hnsw (embedding {operator_class}) "
+            f"WITH (m = {int(self.vector_index.m)}, ef_construction = {int(self.vector_index.ef_construction)})"
+        )
+
+    @contextmanager
+    def _build_lock(self, conn: Connection) -> Iterator[bool]:
+        """Session advisory lock on the index, so one ingestion worker of any process builds it at a time."""
+        key = {"key": f"{self.schema}.{self.vector_index.name}"}
+        locked = conn.execute(text("SELECT pg_try_advisory_lock(hashtext(:key))"), key).scalar()
+        try:
+            yield bool(locked)
+        finally:
+            if locked:
+                conn.execute(text("SELECT pg_advisory_unlock(hashtext(:key))"), key)
+
+    def _build_index(self, conn: Connection, rows: int) -> None:
+        name: str = self.vector_index.name  # type: ignore[assignment]
+        building, old = f"{name}_building", f"{name}_old"
+        settings = list(self.vector_index.configuration.items())
+        if any(not re.fullmatch(r"[\w.]+", key) for key, _ in settings):
+            raise ValueError(f"Invalid index build configuration: {self.vector_index.configuration}")
+        try:
+            for key, value in settings:
+                conn.execute(text("SELECT set_config(:key, :value, false)"), {"key": key, "value": str(value)})
+            # Left over by a build that failed or was interrupted
+            conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{self.schema}"."{building}"'))
+            conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{self.schema}"."{old}"'))
+            logger.info(f"Building {name} on {rows} rows")
+            conn.execute(text(self._index_sql(building, rows)))
+        finally:
+            # The connection goes back to the pool, later users get the server's settings
+            for key, _ in settings:
+                conn.execute(text(f"RESET {key}"))
+        # Renames only lock the indexes briefly, the old index is dropped without blocking searches on the table
+        with self.db_engine.begin() as swap:
+            swap.execute(text(f'ALTER INDEX IF EXISTS "{self.schema}"."{name}" RENAME TO "{old}"'))
+            swap.execute(text(f'ALTER INDEX "{self.schema}"."{building}" RENAME TO "{name}"'))
+        conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{self.schema}"."{old}"'))
+
+    def build_index(self) -> bool:
+        """
+        Build the index, or rebuild it under a temporary name and swap it in, so searches keep using
+        the old index until the new one is ready.
+
+        Returns:
+            bool: False if another worker is building the index, it is left to that worker then.
+        """
+        with self.db_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            with self._build_lock(conn) as locked:
+                if locked:
+                    self._build_index(conn, self.get_count())
+                return locked
+
+    def after_bulk_load(self, rows_added: int) -> Optional[str]:
+        """
+        Create or rebuild the index after rows_added rows were loaded.
+
+        Returns:
+            Optional[str]: "created" or "rebuilt", or None when the index was left as it is or another
+            worker is building it.
+        """
+        with self.db_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            with self._build_lock(conn) as locked:
+                if not locked:
+                    return None
+                rows = self.get_count()
+                if rows < knowledge_settings.vector_index_min_rows:
+                    return None
+                if not self.index_exists():
+                    self._build_index(conn, rows)
+                    return "created"
+                # IVFFlat lists are trained on the rows at build time, HNSW graphs built in bulk are better connected
+                if rows_added / rows >= knowledge_settings.vector_index_rebuild_ratio:
+                    self._build_index(conn, rows)
+                    return "rebuilt"
+                return None
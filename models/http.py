@@ -0,0 +1,119 @@
+import asyncio
+from threading import Lock
+from typing import Any, Dict, Optional
+from weakref import WeakKeyDictionary
+
+import httpx
+
+from models.settings import model_settings
+from utils.log import logger
+
+######################################################
+## Process-wide HTTP clients for model providers
+######################################################
+
+_lock = Lock()
+_http_client: Optional[httpx.Client] = None
+# httpx.AsyncClient connections belong to the event loop that opened them, so there is one client per loop
+_async_http_clients: "WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = WeakKeyDictionary()
+
+
+def get_http_client_params() -> Dict[str, Any]:
+    """Returns the httpx client arguments configured by ModelSettings."""
+    http2 = model_settings.http2
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP/2 needs the h2 package, falling back to HTTP/1.1")
+            http2 = False
+    return {
+        "limits": httpx.Limits(
+            max_connections=model_settings.http_max_connections,
+            max_keepalive_connections=model_settings.http_max_keepalive_connections,
+            keepalive_expiry=model_settings.http_keepalive_expiry,
+        ),
+        "timeout": httpx.Timeout(
+            connect=model_settings.http_connect_timeout,
+            read=model_settings.http_read_timeout,
+            write=model_settings.http_write_timeout,
+            pool=model_settings.http_pool_timeout,
+        ),
+        "http2": http2,
+    }
+
+
+def get_http_client() -> httpx.Client:
+    """Returns the process-wide sync HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        with _lock:
+            if _http_client is None or _http_client.is_closed:
+                _http_client = httpx.Client(**get_http_client_params())
+    return _http_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Returns the async HTTP client of the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    client = _async_http_clients.get(loop)
+    if client is None or client.is_closed:
+        with _lock:
+            client = _async_http_clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(**get_http_client_params())
+                _async_http_clients[loop] = client
+    return client
+
+
+async def aclose_http_clients() -> None:
+    """Close the sync client and the running loop's async client, e.g. on Api shutdown."""
+    global _http_client
+    with _lock:
+        sync_client, _http_client = _http_client, None
+        async_client = _async_http_clients.pop(asyncio.get_running_loop(), None)
+    if sync_client is not None:
+        sync_client.close()
+    if async_client is not None:
+        await async_client.aclose()
+
+
+def _get_pool_metrics(client: Any) -> Dict[str, Any]:
+    # httpx keeps its httpcore connection pool on the transport
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    if pool is None:
+        return {}
+    connections = list(pool.connections)
+    active = sum(1 for connection in connections if not connection.is_idle())
+    queued = sum(1 for request in list(getattr(pool, "_requests", [])) if request.is_queued())
+    return {
+        "connections": len(connections),
+        "active": active,
+        "idle": len(connections) - active,
+        "queued": queued,
+    }
+
+
+def get_http_pool_metrics() -> Dict[str, Any]:
+    """
+    Returns connection pool usage of the shared model HTTP clients.
+
+    `saturation` is the share of max_connections in use, `queued` counts requests waiting for a connection.
+    """
+
+    def with_saturation(metrics: Dict[str, Any]) -> Dict[str, Any]:
+        if metrics:
+            metrics["saturation"] = round(metrics["active"] / model_settings.http_max_connections, 4)
+        return metrics
+
+    sync_metrics = _get_pool_metrics(_http_client) if _http_client is not None else {}
+    async_metrics: Dict[str, Any] = {"connections": 0, "active": 0, "idle": 0, "queued": 0}
+    async_clients = list(_async_http_clients.values())
+    for client in async_clients:
+        for key, value in _get_pool_metrics(client).items():
+            async_metrics[key] += value
+    return {
+        "max_connections": model_settings.http_max_connections,
+        "sync": with_saturation(sync_metrics),
+        "async": with_saturation(async_metrics) if async_clients else {},
+    }
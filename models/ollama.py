@@ -0,0 +1,74 @@
+import asyncio
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from agno.models.ollama import Ollama
+from ollama import AsyncClient as OllamaAsyncClient
+
+from models.http import get_http_client_params
+
+######################################################
+## Ollama clients shared per (host, api key)
+######################################################
+
+_lock = Lock()
+_ClientKey = Tuple[Optional[str], Optional[str]]
+# Like httpx.AsyncClient, an OllamaAsyncClient must stay on the event loop that opened its connections
+_async_clients: "WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[_ClientKey, OllamaAsyncClient]]"
+_async_clients = WeakKeyDictionary()
+
+
+def get_ollama_async_client(
+    host: Optional[str] = None, api_key: Optional[str] = None, timeout: Optional[float] = None
+) -> OllamaAsyncClient:
+    """Returns the OllamaAsyncClient for host and api_key on the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get((host, api_key))
+        if client is None:
+            client_params: Dict[str, Any] = get_http_client_params()
+            if timeout is not None:
+                client_params["timeout"] = timeout
+            headers = {"Authorization": f"Bearer {api_key}"} if api_key else None
+            client = OllamaAsyncClient(host=host, headers=headers, **client_params)
+            clients[(host, api_key)] = client
+    return client
+
+
+async def aclose_ollama_clients() -> None:
+    """Close the running loop's Ollama clients, e.g. on Api shutdown."""
+    with _lock:
+        clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.close()
+
+
+def get_ollama_client_count() -> int:
+    """Returns the number of open OllamaAsyncClients across all event loops."""
+    return sum(len(clients) for clients in list(_async_clients.values()))
+
+
+@dataclass
+class PooledOllama(Ollama):
+    """
+    Ollama that reuses one OllamaAsyncClient, and its keep-alive connections, per host and api key.
+
+    Pass `api_key` instead of a ready-made `async_client`, which would open a new connection
+    pool, and TLS handshake, for every Agent built.
+    """
+
+    api_key: Optional[str] = None
+
+    def _get_client_params(self) -> Dict[str, Any]:
+        client_params = super()._get_client_params()
+        if self.api_key:
+            client_params.setdefault("headers", {"Authorization": f"Bearer {self.api_key}"})
+        return client_params
+
+    def get_async_client(self) -> OllamaAsyncClient:
+        if self.async_client is not None:
+            return self.async_client
+        return get_ollama_async_client(self.host, self.api_key, timeout=self.timeout)
@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from agno.models.openrouter import OpenRouter
+from openai import AsyncOpenAI as AsyncOpenAIClient
+from openai import OpenAI as OpenAIClient
+
+from models.http import get_async_http_client, get_http_client
+
+
+@dataclass
+class PooledOpenRouter(OpenRouter):
+    """
+    OpenRouter that sends every request through the process-wide HTTP clients in models/http.py.
+
+    OpenRouter creates a new HTTP client, and so new connections and TLS handshakes, for every
+    request. This class reuses keep-alive connections across all models in the process instead.
+    Like OpenRouter, an http_client passed by the caller is used for both the sync and async clients.
+    """
+
+    def get_client(self) -> OpenAIClient:
+        client_params: Dict[str, Any] = self._get_client_params()
+        client_params["http_client"] = self.http_client or get_http_client()
+        return OpenAIClient(**client_params)
+
+    def get_async_client(self) -> AsyncOpenAIClient:
+        client_params: Dict[str, Any] = self._get_client_params()
+        client_params["http_client"] = self.http_client or get_async_http_client()
+        return AsyncOpenAIClient(**client_params)
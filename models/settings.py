@@ -0,0 +1,25 @@
+from pydantic_settings import BaseSettings
+
+
+class ModelSettings(BaseSettings):
+    """Settings for the HTTP clients shared by all models, that can be set using environment variables.
+
+    Reference: https://pydantic-docs.helpmanual.io/usage/settings/
+    """
+
+    # Connections kept open per process, for the sync client and for each event loop's async client
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    # Seconds an idle connection is kept open for reuse
+    http_keepalive_expiry: float = 30.0
+    # Timeouts in seconds. Reads are long because completions stream for minutes.
+    http_connect_timeout: float = 10.0
+    http_read_timeout: float = 600.0
+    http_write_timeout: float = 30.0
+    http_pool_timeout: float = 30.0
+    # Requires the h2 package (pip install "httpx[http2]"), falls back to HTTP/1.1 without it
+    http2: bool = False
+
+
+# Create a ModelSettings object
+model_settings = ModelSettings()
@@ -1,25 +1,26 @@
 from textwrap import dedent
-from typing import Optional
+from typing import Literal, Optional
 
 from agno.agent import Agent
 from agno.models.openai import OpenAIChat
-from agno.models.openrouter import OpenRouter
-from agno.storage.postgres import PostgresStorage
 from agno.team.team import Team
 from agno.tools.duckduckgo import DuckDuckGoTools
-from agno.tools.yfinance import YFinanceTools
 
-from db.session import db_url
+from agents.pool import bind_agent
+from db.session import db_engine
+from db.storage import AsyncPostgresStorage
+from models.openrouter import PooledOpenRouter
 from teams.settings import team_settings
+from tools.market_data import CachedYFinanceTools
 
 finance_agent = Agent(
     name="Finance Agent",
     role="Analyze financial data",
     agent_id="finance-agent",
-    model=OpenRouter(
+    model=PooledOpenRouter(
         id="moonshotai/kimi-k2:free",
     ),
-    tools=[YFinanceTools(enable_all=True, cache_results=True)],
+    tools=[CachedYFinanceTools(enable_all=True)],
     instructions=dedent("""\
         You are a seasoned Wall Street analyst with deep expertise in market analysis! 📊
 
@@ -53,7 +54,7 @@ finance_agent = Agent(
         - Note market uncertainties
         - Mention relevant regulatory concerns
     """),
-    storage=PostgresStorage(table_name="finance_agent", db_url=db_url, auto_upgrade_schema=True),
+    storage=AsyncPostgresStorage(table_name="finance_agent", db_engine=db_engine, auto_upgrade_schema=True),
     add_history_to_messages=True,
     num_history_responses=5,
     add_datetime_to_instructions=True,
@@ -64,7 +65,7 @@ finance_agent = Agent(
 web_agent = Agent(
     name="Web Agent",
     role="Search the web for information",
-    model=OpenRouter(
+    model=PooledOpenRouter(
         id="moonshotai/kimi-k2:free",
     ),
     tools=[DuckDuckGoTools(cache_results=True)],
@@ -74,7 +75,7 @@ web_agent = Agent(
     ],
     show_tool_calls=True,
     markdown=True,
-    storage=PostgresStorage(table_name="web_agent", db_url=db_url, auto_upgrade_schema=True),
+    storage=AsyncPostgresStorage(table_name="web_agent", db_engine=db_engine, auto_upgrade_schema=True),
     monitoring=True,
 )
 
@@ -84,30 +85,45 @@ def get_finance_researcher_team(
     user_id: Optional[str] = None,
     session_id: Optional[str] = None,
     debug_mode: bool = True,
+    mode: Literal["route", "collaborate"] = "route",
 ):
+    """
+    Args:
+        mode: "route" sends each question to the one member best suited to answer it.
+            "collaborate" runs both members concurrently on the same question and merges their findings.
+    """
     # Default to Kimi-k2 Free model
     model_id = model_id or "moonshotai/kimi-k2:free"
 
+    instructions = ["You are a team of finance researchers!"]
+    if mode == "collaborate":
+        instructions += [
+            "Send the research question to all members at once with run_member_agents.",
+            "Merge the market data from the Finance Agent and the news from the Web Agent into one report.",
+        ]
+
     return Team(
         name="Finance Researcher Team",
         team_id="financial-researcher-team",
-        mode="route",
-        members=[web_agent, finance_agent],
-        instructions=[
-            "You are a team of finance researchers!",
+        mode=mode,
+        # Each Team gets its own copies of the member agents, sharing their models, tools and storage
+        members=[
+            bind_agent(web_agent, user_id=user_id, session_id=session_id, with_user_context=False),
+            bind_agent(finance_agent, user_id=user_id, session_id=session_id, with_user_context=False),
         ],
+        instructions=instructions,
         session_id=session_id,
         user_id=user_id,
         description="You are a team of finance researchers!",
-        model=OpenRouter(
+        model=PooledOpenRouter(
             id=model_id,
         ),
         success_criteria="A good financial research report.",
         enable_agentic_context=True,
         expected_output="A good financial research report.",
-        storage=PostgresStorage(
+        storage=AsyncPostgresStorage(
             table_name="finance_researcher_team",
-            db_url=db_url,
+            db_engine=db_engine,
             mode="team",
             auto_upgrade_schema=True,
         ),
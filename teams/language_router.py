@@ -0,0 +1,124 @@
+import re
+from typing import Dict, Optional, Tuple
+
+######################################################
+## Deterministic language detection for the multi-language team
+######################################################
+
+# Languages the multi-language team has member agents for
+SUPPORTED_LANGUAGES = ("japanese", "chinese", "spanish", "french", "german")
+
+# Explicit requests such as "answer in French" or "réponds en français"
+_LANGUAGE_NAMES: Dict[str, str] = {
+    "japanese": "japanese",
+    "日本語": "japanese",
+    "chinese": "chinese",
+    "mandarin": "chinese",
+    "中文": "chinese",
+    "spanish": "spanish",
+    "español": "spanish",
+    "espanol": "spanish",
+    "french": "french",
+    "français": "french",
+    "francais": "french",
+    "german": "german",
+    "deutsch": "german",
+    "english": "english",
+    "italian": "italian",
+    "italiano": "italian",
+}
+_LANGUAGES = "|".join(_LANGUAGE_NAMES)
+# Only phrasings about the answer count, "in German" alone is as often about the topic ("cars in German industry")
+_EXPLICIT_REQUEST = re.compile(
+    r"\b(?:answer|respond|reply|write|speak|talk|réponds|répondez|responde|responda|contesta|antworte|antworten)"
+    r"(?:\s+(?:me|us|it|this|that|back|only|please|sie|the question|your answer))*"
+    r"\s+(?:in|en|auf)\s+(" + _LANGUAGES + r")\b"
+    r"|\btranslate(?:d)?\b[^.?!\n]{0,80}?\b(?:into|to|in)\s+(" + _LANGUAGES + r")\b",
+    re.IGNORECASE,
+)
+
+_KANA = re.compile(r"[぀-ヿ]")
+_HAN = re.compile(r"[一-鿿]")
+_HANGUL = re.compile(r"[가-힯]")
+_NON_LATIN_SCRIPTS = re.compile(r"[Ѐ-ӿ֐-׿؀-ۿऀ-ॿ฀-๿]")
+
+# Frequent function words, characters and diacritics of each Latin-script language
+_STOPWORDS: Dict[str, frozenset] = {
+    "english": frozenset(
+        "the and is are what how why who which of to in for with you your can do does this that it on be".split()
+    ),
+    "spanish": frozenset(
+        "el la los las es son qué que cómo como por qué para con un una del al está están yo tú usted "
+        "puedes dónde cuál cuáles muy pero también hola gracias".split()
+    ),
+    "french": frozenset(
+        "le la les est sont qu'est-ce que quoi comment pourquoi pour avec un une des du au je tu vous "
+        "peux pouvez où quel quelle très mais aussi bonjour merci c'est".split()
+    ),
+    "german": frozenset(
+        "der die das ist sind was wie warum für mit ein eine einen dem den ich du sie können kannst "
+        "wo welche sehr aber auch hallo danke nicht und".split()
+    ),
+    "italian": frozenset(
+        "il lo gli è sono cosa come perché per con uno una della del io tu lei puoi dove quale molto ma "
+        "anche ciao grazie non".split()
+    ),
+}
+_MARKERS: Dict[str, re.Pattern] = {
+    "spanish": re.compile(r"[ñ¿¡]"),
+    "french": re.compile(r"[çœèêëîôû]"),
+    "german": re.compile(r"[ßäöü]"),
+}
+
+# Minimum share of the Latin-script votes the winning language needs
+_MIN_CONFIDENCE = 0.6
+# Minimum number of votes before a Latin-script guess is trusted
+_MIN_VOTES = 2
+
+
+def detect_language(message: str) -> Tuple[Optional[str], float]:
+    """
+    Detect the language a message should be answered in, without calling a model.
+
+    An explicit request ("answer in French", "translate this into German") wins, a language
+    merely mentioned ("restaurants in the French Quarter") does not. Otherwise the script decides for Japanese,
+    Chinese and other non-Latin languages, and function words and diacritics decide between
+    Latin-script languages.
+
+    Returns:
+        Tuple[Optional[str], float]: The language and a confidence between 0 and 1,
+            or (None, 0.0) when the message gives too little to go on.
+    """
+    explicit = _EXPLICIT_REQUEST.search(message)
+    if explicit:
+        return _LANGUAGE_NAMES[(explicit.group(1) or explicit.group(2)).lower()], 1.0
+
+    if _KANA.search(message):
+        return "japanese", 1.0
+    if _HAN.search(message):
+        return "chinese", 0.9
+    if _HANGUL.search(message) or _NON_LATIN_SCRIPTS.search(message):
+        return "other", 0.9
+
+    words = re.findall(r"[\w'-]+", message.lower())
+    votes: Dict[str, float] = {language: 0.0 for language in _STOPWORDS}
+    for word in words:
+        for language, stopwords in _STOPWORDS.items():
+            if word in stopwords:
+                votes[language] += 1
+    for language, marker in _MARKERS.items():
+        votes[language] += 2 * len(marker.findall(message.lower()))
+
+    total = sum(votes.values())
+    if total < _MIN_VOTES:
+        return None, 0.0
+    language = max(votes, key=lambda k: votes[k])
+    return language, votes[language] / total
+
+
+def route_language(message: str) -> Optional[str]:
+    """Returns the supported language to route message to, or None when the team leader should decide."""
+    language, confidence = detect_language(message)
+    if language in SUPPORTED_LANGUAGES and confidence >= _MIN_CONFIDENCE:
+        return language
+    return None
@@ -2,18 +2,20 @@ from typing import Optional
 
 from agno.agent import Agent
 from agno.models.openai import OpenAIChat
-from agno.models.openrouter import OpenRouter
-from agno.storage.postgres import PostgresStorage
 from agno.team.team import Team
 
-from db.session import db_url
+from agents.pool import bind_agent
+from db.session import db_engine
+from db.storage import AsyncPostgresStorage
+from models.openrouter import PooledOpenRouter
+from teams.language_router import route_language
 from teams.settings import team_settings
 
 japanese_agent = Agent(
     name="Japanese Agent",
     agent_id="japanese-agent",
     role="You only answer in Japanese",
-    model=OpenRouter(
+    model=PooledOpenRouter(
         id="moonshotai/kimi-k2:free",
     ),
     monitoring=True,
@@ -22,7 +24,7 @@ chinese_agent = Agent(
     name="Chinese Agent",
     agent_id="chinese-agent",
     role="You only answer in Chinese",
-    model=OpenRouter(
+    model=PooledOpenRouter(
         id="moonshotai/kimi-k2:free",
     ),
     monitoring=True,
@@ -31,7 +33,7 @@ spanish_agent = Agent(
     name="Spanish Agent",
     agent_id="spanish-agent",
     role="You only answer in Spanish",
-    model=OpenRouter(
+    model=PooledOpenRouter(
         id="moonshotai/kimi-k2:free",
     ),
     monitoring=True,
@@ -40,7 +42,7 @@ french_agent = Agent(
     name="French Agent",
     agent_id="french-agent",
     role="You only answer in French",
-    model=OpenRouter(
+    model=PooledOpenRouter(
         id="moonshotai/kimi-k2:free",
     ),
     monitoring=True,
@@ -49,12 +51,38 @@ german_agent = Agent(
     name="German Agent",
     agent_id="german-agent",
     role="You only answer in German",
-    model=OpenRouter(
+    model=PooledOpenRouter(
         id="moonshotai/kimi-k2:free",
     ),
     monitoring=True,
 )
 
+# Member agent_id for each language the team supports
+LANGUAGE_AGENT_IDS = {
+    "japanese": "japanese-agent",
+    "chinese": "chinese-agent",
+    "spanish": "spanish-agent",
+    "french": "french-agent",
+    "german": "german-agent",
+}
+
+
+def route_to_member(team: Team, message: str) -> Optional[Agent]:
+    """
+    Pick the member agent for the language of message without a leader model call.
+
+    Returns:
+        Optional[Agent]: A copy of the member agent bound to the team's user and session,
+            or None when the language is unclear and the team leader should route.
+    """
+    language = route_language(message)
+    if language is None:
+        return None
+    for member in team.members:
+        if isinstance(member, Agent) and member.agent_id == LANGUAGE_AGENT_IDS[language]:
+            return bind_agent(member, user_id=team.user_id, session_id=team.session_id, with_user_context=False)
+    return None
+
 
 def get_multi_language_team(
     model_id: Optional[str] = None,
@@ -69,15 +97,13 @@ def get_multi_language_team(
         name="Multi Language Team",
         mode="route",
         team_id="multi-language-team",
-        model=OpenRouter(
+        model=PooledOpenRouter(
             id=model_id,
         ),
+        # Each Team gets its own copies of the member agents, sharing their models
         members=[
-            spanish_agent,
-            japanese_agent,
-            french_agent,
-            german_agent,
-            chinese_agent,
+            bind_agent(member, user_id=user_id, session_id=session_id, with_user_context=False)
+            for member in (spanish_agent, japanese_agent, french_agent, german_agent, chinese_agent)
         ],
         description="You are a language router that directs questions to the appropriate language agent.",
         instructions=[
@@ -94,9 +120,9 @@ def get_multi_language_team(
         markdown=True,
         show_tool_calls=True,
         show_members_responses=True,
-        storage=PostgresStorage(
+        storage=AsyncPostgresStorage(
             table_name="multi_language_team",
-            db_url=db_url,
+            db_engine=db_engine,
             mode="team",
             auto_upgrade_schema=True,
         ),
@@ -1,8 +1,13 @@
 from enum import Enum
-from typing import List, Optional
+from typing import List, Optional, Union
 
-from teams.finance_researcher import get_finance_researcher_team
-from teams.multi_language import get_multi_language_team
+from agno.agent import Agent
+from agno.models.message import Message
+from agno.run.base import RunStatus
+from agno.run.team import TeamRunResponse
+from agno.team import Team
+
+from utils.metrics import LatencyMetrics
 
 
 class TeamType(Enum):
@@ -10,6 +15,19 @@ class TeamType(Enum):
     MULTI_LANGUAGE = "multi-language"
 
 
+class TeamMode(Enum):
+    ROUTE = "route"
+    # Run every member concurrently on the same task. Only the finance researcher team supports it.
+    COLLABORATE = "collaborate"
+
+
+# Team run latencies, keyed by "<team_id>:<mode>"
+team_run_latency = LatencyMetrics()
+
+# Earlier runs of the team session a pre-routed member sees
+PRE_ROUTED_HISTORY_RUNS = 3
+
+
 def get_available_teams() -> List[str]:
     """Returns a list of all available team IDs."""
     return [team.value for team in TeamType]
@@ -21,10 +39,76 @@ def get_team(
     user_id: Optional[str] = None,
     session_id: Optional[str] = None,
     debug_mode: bool = True,
+    mode: TeamMode = TeamMode.ROUTE,
 ):
+    # Team modules are imported on first use to keep Api startup fast
     if team_id == TeamType.FINANCE_RESEARCHER:
+        from teams.finance_researcher import get_finance_researcher_team
+
         return get_finance_researcher_team(
-            model_id=model_id, user_id=user_id, session_id=session_id, debug_mode=debug_mode
+            model_id=model_id, user_id=user_id, session_id=session_id, debug_mode=debug_mode, mode=mode.value
         )
     else:
+        from teams.multi_language import get_multi_language_team
+
         return get_multi_language_team(model_id=model_id, user_id=user_id, session_id=session_id, debug_mode=debug_mode)
+
+
+def pre_route(team_id: TeamType, team: Team, message: str) -> Union[Agent, Team]:
+    """
+    Returns the member Agent that should answer message directly, skipping the team leader,
+    or the team itself when its leader should decide.
+    """
+    if team_id == TeamType.MULTI_LANGUAGE:
+        from teams.multi_language import route_to_member
+
+        member = route_to_member(team, message)
+        if member is not None:
+            return member
+    return team
+
+
+def add_team_history(team: Team, member: Agent) -> None:
+    """
+    Load the team session and give a pre-routed member its last exchanges, so follow-up
+    questions keep their context. Only user and assistant text is passed on, the leader's
+    tool calls are not.
+    """
+    if team.session_id is None:
+        return
+    team.initialize_team(session_id=team.session_id)
+    team.read_from_storage(session_id=team.session_id)
+    history = team.memory.get_messages_from_last_n_runs(  # type: ignore
+        session_id=team.session_id, last_n=PRE_ROUTED_HISTORY_RUNS, skip_role="system"
+    )
+    member.add_messages = [
+        Message(role=message.role, content=message.content)
+        for message in history
+        if message.role in ("user", "assistant") and isinstance(message.content, str) and message.content
+    ]
+
+
+def record_pre_routed_run(team: Team, member: Agent, message: str) -> None:
+    """Store the exchange of a pre-routed member in the team session, like a run routed by the leader."""
+    response = member.run_response
+    if team.session_id is None or team.memory is None or response is None or response.content is None:
+        return
+    content = response.content if isinstance(response.content, str) else str(response.content)
+    team_run = TeamRunResponse(
+        run_id=response.run_id,
+        team_id=team.team_id,
+        team_name=team.name,
+        session_id=team.session_id,
+        content=content,
+        messages=[Message(role="user", content=message), Message(role="assistant", content=content)],
+        member_responses=[response],
+        model=response.model,
+        model_provider=response.model_provider,
+        metrics=response.metrics,
+        status=RunStatus.completed,
+    )
+    team.memory.add_interaction_to_team_context(  # type: ignore
+        session_id=team.session_id, member_name=member.name or "member", task=message, run_response=response
+    )
+    team.memory.add_run(session_id=team.session_id, run=team_run)  # type: ignore
+    team.write_to_storage(session_id=team.session_id, user_id=team.user_id)
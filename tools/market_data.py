@@ -0,0 +1,122 @@
+from concurrent.futures import Future
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+
+from agno.tools.yfinance import YFinanceTools
+
+from db.cache import PgCache
+from utils.log import logger
+
+# Seconds each type of market data stays fresh, keyed by YFinanceTools method
+MARKET_DATA_TTLS: Dict[str, int] = {
+    "get_current_stock_price": 5 * 60,
+    "get_technical_indicators": 15 * 60,
+    "get_company_news": 30 * 60,
+    "get_historical_stock_prices": 60 * 60,
+    "get_analyst_recommendations": 6 * 60 * 60,
+    "get_company_info": 24 * 60 * 60,
+    "get_stock_fundamentals": 24 * 60 * 60,
+    "get_key_financial_ratios": 24 * 60 * 60,
+    "get_income_statements": 24 * 60 * 60,
+}
+
+# Market data shared by every Api worker, Streamlit and the workflows
+market_data_cache = PgCache("market_data", ttl=24 * 60 * 60, max_entries=5000)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls: while a call for a key runs, other callers for that key wait for its result."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._calls: Dict[str, Future] = {}
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            future: Optional[Future] = self._calls.get(key)
+            leader = future is None
+            if future is None:
+                future = Future()
+                self._calls[key] = future
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+# One per process, so every CachedYFinanceTools instance coalesces with the others
+market_data_flight = SingleFlight()
+
+
+def is_error(result: str) -> bool:
+    """YFinanceTools returns errors as strings, these are never cached."""
+    return result.startswith(("Error ", "Could not "))
+
+
+class CachedYFinanceTools(YFinanceTools):
+    """
+    YFinanceTools backed by the shared market_data cache.
+
+    Results are cached in Postgres with a TTL per data type (see MARKET_DATA_TTLS), so
+    all processes share them. Concurrent calls for the same data in one process trigger
+    a single upstream fetch.
+    """
+
+    def _cached(self, method: str, fetch: Callable[..., str], *args: Any) -> str:
+        key = ":".join([method, *(str(arg) for arg in args)])
+
+        def load() -> str:
+            cached = market_data_cache.get(key)
+            if cached is not None:
+                return cached["result"]
+            result = fetch(*args)
+            if is_error(result):
+                logger.debug(f"Not caching {key}: {result}")
+            else:
+                market_data_cache.set(key, {"result": result}, ttl=MARKET_DATA_TTLS[method])
+            return result
+
+        return market_data_flight.do(key, load)
+
+    # The overrides keep the signatures of YFinanceTools, their tool descriptions come from its docstrings
+
+    def get_current_stock_price(self, symbol: str) -> str:
+        return self._cached("get_current_stock_price", super().get_current_stock_price, symbol.upper())
+
+    def get_company_info(self, symbol: str) -> str:
+        return self._cached("get_company_info", super().get_company_info, symbol.upper())
+
+    def get_historical_stock_prices(self, symbol: str, period: str = "1mo", interval: str = "1d") -> str:
+        return self._cached(
+            "get_historical_stock_prices", super().get_historical_stock_prices, symbol.upper(), period, interval
+        )
+
+    def get_stock_fundamentals(self, symbol: str) -> str:
+        return self._cached("get_stock_fundamentals", super().get_stock_fundamentals, symbol.upper())
+
+    def get_income_statements(self, symbol: str) -> str:
+        return self._cached("get_income_statements", super().get_income_statements, symbol.upper())
+
+    def get_key_financial_ratios(self, symbol: str) -> str:
+        return self._cached("get_key_financial_ratios", super().get_key_financial_ratios, symbol.upper())
+
+    def get_analyst_recommendations(self, symbol: str) -> str:
+        return self._cached("get_analyst_recommendations", super().get_analyst_recommendations, symbol.upper())
+
+    def get_company_news(self, symbol: str, num_stories: int = 3) -> str:
+        return self._cached("get_company_news", super().get_company_news, symbol.upper(), num_stories)
+
+    def get_technical_indicators(self, symbol: str, period: str = "3mo") -> str:
+        return self._cached("get_technical_indicators", super().get_technical_indicators, symbol.upper(), period)
@@ -1,17 +1,15 @@
+from io import BytesIO
 from typing import Any, Callable, Dict, List, Optional, Union
 
 import streamlit as st
 from agno.agent import Agent
-from agno.document import Document
-from agno.document.reader import Reader
-from agno.document.reader.csv_reader import CSVReader
-from agno.document.reader.docx_reader import DocxReader
-from agno.document.reader.pdf_reader import PDFReader
-from agno.document.reader.text_reader import TextReader
 from agno.document.reader.website_reader import WebsiteReader
 from agno.models.response import ToolExecution
 from agno.utils.log import logger
 
+from knowledge.dedup import forget_documents, hash_content
+from knowledge.ingestion import get_reader, ingestion_pipeline
+
 
 async def initialize_agent_session_state(agent_name: str):
     logger.info(f"---*--- Initializing session state for {agent_name} ---*---")
@@ -170,6 +168,25 @@ async def example_inputs(agent_name: str) -> None:
                 )
 
 
+@st.fragment(run_every=1)
+def ingestion_progress(agent_name: str) -> None:
+    """Show the progress of the agent's document ingestion, refreshed every second without rerunning the page."""
+    for job_id in st.session_state[agent_name].get("ingestion_jobs", []):
+        job = ingestion_pipeline.get_job(job_id)
+        if job is None:
+            continue
+        if job.status == "failed":
+            st.error(f"Could not add {job.name}: {job.error}")
+        elif job.duplicate_of is not None:
+            st.info(f"{job.name} is already in the knowledge base as {job.duplicate_of}")
+        elif job.status == "done":
+            st.success(f"Added {job.name} ({job.chunks_stored} new chunks, {job.chunks_skipped} unchanged)")
+        elif job.status == "indexing":
+            st.progress(job.progress, text=f"Indexing {job.name}: {job.chunks_stored} chunks stored")
+        else:
+            st.progress(job.progress, text=f"Adding {job.name}: {job.chunks_stored} chunks stored")
+
+
 async def knowledge_widget(agent_name: str, agent: Agent) -> None:
     """Display a knowledge widget in the sidebar."""
 
@@ -186,11 +203,8 @@ async def knowledge_widget(agent_name: str, agent: Agent) -> None:
                 alert = st.sidebar.info("Processing URLs...", icon="ℹ️")
                 if f"{input_url}_scraped" not in st.session_state:
                     scraper = WebsiteReader(max_links=2, max_depth=1)
-                    web_documents: List[Document] = scraper.read(input_url)
-                    if web_documents:
-                        agent.knowledge.load_documents(web_documents, upsert=True)
-                    else:
-                        st.sidebar.error("Could not read website")
+                    job = ingestion_pipeline.submit(input_url, scraper, input_url, agent.knowledge.vector_db)
+                    st.session_state[agent_name].setdefault("ingestion_jobs", []).append(job.job_id)
                     st.session_state[f"{input_url}_uploaded"] = True
                 alert.empty()
 
@@ -204,32 +218,31 @@ async def knowledge_widget(agent_name: str, agent: Agent) -> None:
         if uploaded_file is not None:
             alert = st.sidebar.info("Processing document...", icon="🧠")
             document_name = uploaded_file.name.split(".")[0]
-            if f"{document_name}_uploaded" not in st.session_state:
-                file_type = uploaded_file.name.split(".")[-1].lower()
-
-                reader: Reader
-                if file_type == "pdf":
-                    reader = PDFReader()
-                elif file_type == "csv":
-                    reader = CSVReader()
-                elif file_type == "txt":
-                    reader = TextReader()
-                elif file_type == "docx":
-                    reader = DocxReader()
-                else:
+            content_hash = hash_content(uploaded_file.getvalue())
+            # Keyed by content too, so a different file with the same name is still added
+            if f"{document_name}_{content_hash}_uploaded" not in st.session_state:
+                reader = get_reader(uploaded_file.name)
+                if reader is None:
+                    alert.empty()
                     st.sidebar.error("Unsupported file type")
                     return
-                uploaded_file_documents: List[Document] = reader.read(uploaded_file)
-                if uploaded_file_documents:
-                    agent.knowledge.load_documents(uploaded_file_documents, upsert=True)
-                else:
-                    st.sidebar.error("Could not read document")
-                st.session_state[f"{document_name}_uploaded"] = True
+                # Ingest in the background from a copy, the upload is released when this script run ends
+                source = BytesIO(uploaded_file.getvalue())
+                source.name = uploaded_file.name
+                job = ingestion_pipeline.submit(
+                    document_name, reader, source, agent.knowledge.vector_db, content_hash=content_hash
+                )
+                st.session_state[agent_name].setdefault("ingestion_jobs", []).append(job.job_id)
+                st.session_state[f"{document_name}_{content_hash}_uploaded"] = True
             alert.empty()
 
+        with st.sidebar:
+            ingestion_progress(agent_name)
+
         # Load and delete knowledge
         if st.sidebar.button("🗑️ Delete Knowledge"):
             agent.knowledge.delete()
+            forget_documents(agent.knowledge.vector_db.table.fullname)
             st.sidebar.success("Knowledge deleted!")
 
 
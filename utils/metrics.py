@@ -0,0 +1,45 @@
+import math
+from collections import deque
+from statistics import mean
+from threading import Lock
+from typing import Any, Deque, Dict, Optional
+
+
+def percentile(values: list, q: float) -> Optional[float]:
+    """Returns the q-th percentile (0-100) of values using the nearest-rank method."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class LatencyMetrics:
+    """Latencies in seconds per key, keeping the most recent `window` samples of each key."""
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self._lock = Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Returns count, mean, p50, p95 and max per key, in seconds over the current window."""
+        with self._lock:
+            samples = {key: list(values) for key, values in self._samples.items()}
+            counts = dict(self._counts)
+        return {
+            key: {
+                "count": counts[key],
+                "mean": round(mean(values), 4),
+                "p50": round(percentile(values, 50), 4),  # type: ignore
+                "p95": round(percentile(values, 95), 4),  # type: ignore
+                "max": round(max(values), 4),
+            }
+            for key, values in samples.items()
+        }
@@ -1,23 +1,48 @@
 # Apply agno-ck metadata fix before any agno imports
 import agno_metadata_fix
 
+import base64
 import json
+import re
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from textwrap import dedent
-from typing import Dict, Iterator, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
+import newspaper
 from agno.agent import Agent
 from agno.models.openai import OpenAIChat
-from agno.models.openrouter import OpenRouter
 from agno.storage.postgres import PostgresStorage
 from agno.tools.duckduckgo import DuckDuckGoTools
 from agno.tools.newspaper4k import Newspaper4kTools
 from agno.utils.log import logger
 from agno.workflow import RunEvent, RunResponse, Workflow
+from bs4 import BeautifulSoup
 from pydantic import BaseModel, Field
 
-from db.session import db_url
+from db.cache import PgCache, normalize_key
+from db.session import db_engine
+from models.openrouter import PooledOpenRouter
 from workflows.settings import workflow_settings
 
+# Research caches shared by every session and user, keyed by normalized topic
+blog_search_cache = PgCache(
+    "blog_search_results",
+    ttl=workflow_settings.blog_search_cache_ttl,
+    max_entries=workflow_settings.blog_cache_max_entries,
+)
+blog_scrape_cache = PgCache(
+    "blog_scraped_articles",
+    ttl=workflow_settings.blog_scrape_cache_ttl,
+    max_entries=workflow_settings.blog_cache_max_entries,
+)
+blog_post_cache = PgCache(
+    "blog_posts",
+    ttl=workflow_settings.blog_post_cache_ttl,
+    max_entries=workflow_settings.blog_cache_max_entries,
+)
+
 
 class NewsArticle(BaseModel):
     title: str = Field(..., description="Title of the article.")
@@ -39,6 +64,98 @@ class ScrapedArticle(BaseModel):
     )
 
 
+def compress_text(text: str) -> str:
+    """Compress text into an ASCII string that can be stored in JSON."""
+    return base64.b64encode(zlib.compress(text.encode("utf-8"))).decode("ascii")
+
+
+def decompress_text(data: str) -> str:
+    return zlib.decompress(base64.b64decode(data)).decode("utf-8")
+
+
+def pack_scraped_articles(scraped_articles: Dict[str, ScrapedArticle]) -> Dict[str, Dict[str, Any]]:
+    """Dump scraped articles for session_state, with their content compressed into `content_zlib`."""
+    packed: Dict[str, Dict[str, Any]] = {}
+    for url, article in scraped_articles.items():
+        data = article.model_dump(exclude={"content"})
+        data["content"] = None
+        data["content_zlib"] = compress_text(article.content) if article.content else None
+        packed[url] = data
+    return packed
+
+
+def unpack_scraped_articles(packed: Dict[str, Any]) -> Dict[str, ScrapedArticle]:
+    """Load scraped articles stored by pack_scraped_articles(), or stored uncompressed by older versions."""
+    scraped_articles: Dict[str, ScrapedArticle] = {}
+    for url, article in packed.items():
+        if isinstance(article, ScrapedArticle):
+            scraped_articles[url] = article
+            continue
+        data = dict(article)
+        content_zlib = data.pop("content_zlib", None)
+        if content_zlib is not None:
+            data["content"] = decompress_text(content_zlib)
+        scraped_articles[url] = ScrapedArticle.model_validate(data)
+    return scraped_articles
+
+
+def html_to_markdown(html: str) -> str:
+    """Convert the main content of an HTML page to markdown headings, paragraphs and list items."""
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "noscript", "nav", "header", "footer", "aside", "form"]):
+        tag.decompose()
+    root = soup.find("article") or soup.find("main") or soup.body or soup
+
+    blocks = []
+    for element in root.find_all(["h1", "h2", "h3", "h4", "p", "li"]):
+        text = " ".join(element.get_text(" ", strip=True).split())
+        if not text:
+            continue
+        if element.name in ("h1", "h2", "h3", "h4"):
+            blocks.append(f"{'#' * int(element.name[1])} {text}")
+        elif element.name == "li":
+            blocks.append(f"- {text}")
+        else:
+            blocks.append(text)
+    return "\n\n".join(blocks)
+
+
+def extract_article(article: NewsArticle, min_words: int = 100, timeout: float = 30) -> Optional[ScrapedArticle]:
+    """
+    Extract an article in-process with newspaper4k, falling back to BeautifulSoup, without calling a model.
+
+    Args:
+        article: The article to extract
+        min_words: Extractions with fewer words are treated as failures
+        timeout: Seconds allowed for downloading the page
+
+    Returns:
+        Optional[ScrapedArticle]: The article with its content, or None if extraction failed
+    """
+    try:
+        page = newspaper.Article(article.url, request_timeout=timeout)
+        page.download()
+        page.parse()
+    except Exception as e:
+        logger.debug(f"Direct extraction failed for {article.url}: {e}")
+        return None
+
+    content = page.text or ""
+    # Fall back to BeautifulSoup when newspaper4k misses the article body
+    if len(content.split()) < min_words and page.html:
+        content = html_to_markdown(page.html)
+    if len(content.split()) < min_words:
+        logger.debug(f"Direct extraction found too little text for {article.url}")
+        return None
+
+    return ScrapedArticle(
+        title=page.title or article.title,
+        url=article.url,
+        summary=article.summary,
+        content=content,
+    )
+
+
 class BlogPostGenerator(Workflow):
     """Advanced workflow for generating professional blog posts with proper research and citations."""
 
@@ -50,9 +167,18 @@ class BlogPostGenerator(Workflow):
     digital consumption.
     """)
 
+    # Maximum number of articles scraped at the same time
+    scrape_max_workers: int = 4
+    # Seconds after which a single article scrape is abandoned
+    scrape_timeout: float = 120
+    # Topics kept in each session_state cache, the oldest are evicted first
+    max_session_topics: int = 20
+    # Extract articles with newspaper4k and BeautifulSoup, only using the article_scraper Agent if that fails
+    direct_extraction: bool = True
+
     # Search Agent: Handles intelligent web searching and source gathering
     searcher: Agent = Agent(
-        model=OpenRouter(id="moonshotai/kimi-k2:free"),
+        model=PooledOpenRouter(id="moonshotai/kimi-k2:free"),
         tools=[DuckDuckGoTools()],
         description=dedent("""\
         You are BlogResearch-X, an elite research assistant specializing in discovering
@@ -95,7 +221,7 @@ class BlogPostGenerator(Workflow):
 
     # Content Scraper: Extracts and processes article content
     article_scraper: Agent = Agent(
-        model=OpenRouter(id="moonshotai/kimi-k2:free"),
+        model=PooledOpenRouter(id="moonshotai/kimi-k2:free"),
         tools=[Newspaper4kTools()],
         description=dedent("""\
         You are ContentBot-X, a specialist in extracting and processing digital content
@@ -136,7 +262,7 @@ class BlogPostGenerator(Workflow):
 
     # Content Writer Agent: Crafts engaging blog posts from research
     writer: Agent = Agent(
-        model=OpenRouter(id="moonshotai/kimi-k2:free"),
+        model=PooledOpenRouter(id="moonshotai/kimi-k2:free"),
         description=dedent("""\
         You are BlogMaster-X, an elite content creator combining journalistic excellence
         with digital marketing expertise. Your strengths include:
@@ -239,19 +365,43 @@ class BlogPostGenerator(Workflow):
         if self.writer.run_response:
             self.add_blog_post_to_cache(topic, str(self.writer.run_response.content))
 
+    def add_session_entry(self, key: str, topic: str, value: Any):
+        """Store a topic in session_state[key] and evict the oldest topics over max_session_topics."""
+        entries: Dict[str, Any] = self.session_state.setdefault(key, {})
+        entries[topic] = value
+        # session_state is stored as JSONB, which does not keep the order of object keys,
+        # so the topics of each cache are also kept in a list from oldest to newest
+        topic_order: Dict[str, List[str]] = self.session_state.setdefault("topic_order", {})
+        order = [t for t in topic_order.get(key, []) if t in entries and t != topic] + [topic]
+        # Topics stored before their order was recorded are evicted first
+        order = [t for t in entries if t not in order] + order
+        while len(order) > self.max_session_topics:
+            evicted = order.pop(0)
+            del entries[evicted]
+            logger.info(f"Evicted {key} for topic: {evicted}")
+        topic_order[key] = order
+
     def get_cached_blog_post(self, topic: str) -> Optional[str]:
         logger.info("Checking if cached blog post exists")
-
-        return self.session_state.get("blog_posts", {}).get(topic)
+        blog_post = self.session_state.get("blog_posts", {}).get(topic)
+        if blog_post is None:
+            blog_post = blog_post_cache.get(normalize_key(topic))
+            if blog_post is not None:
+                self.add_session_entry("blog_posts", topic, blog_post)
+        return blog_post
 
     def add_blog_post_to_cache(self, topic: str, blog_post: str):
         logger.info(f"Saving blog post for topic: {topic}")
-        self.session_state.setdefault("blog_posts", {})
-        self.session_state["blog_posts"][topic] = blog_post
+        self.add_session_entry("blog_posts", topic, blog_post)
+        blog_post_cache.set(normalize_key(topic), blog_post)
 
     def get_cached_search_results(self, topic: str) -> Optional[SearchResults]:
         logger.info("Checking if cached search results exist")
         search_results = self.session_state.get("search_results", {}).get(topic)
+        if search_results is None:
+            search_results = blog_search_cache.get(normalize_key(topic))
+            if search_results is not None:
+                self.add_session_entry("search_results", topic, search_results)
         return (
             SearchResults.model_validate(search_results)
             if search_results and isinstance(search_results, dict)
@@ -260,22 +410,28 @@ class BlogPostGenerator(Workflow):
 
     def add_search_results_to_cache(self, topic: str, search_results: SearchResults):
         logger.info(f"Saving search results for topic: {topic}")
-        self.session_state.setdefault("search_results", {})
-        self.session_state["search_results"][topic] = search_results
+        self.add_session_entry("search_results", topic, search_results.model_dump())
+        blog_search_cache.set(normalize_key(topic), search_results.model_dump())
 
-    def get_cached_scraped_articles(self, topic: str):
+    def get_cached_scraped_articles(self, topic: str) -> Optional[Dict[str, ScrapedArticle]]:
         logger.info("Checking if cached scraped articles exist")
         scraped_articles = self.session_state.get("scraped_articles", {}).get(topic)
-        return (
-            ScrapedArticle.model_validate(scraped_articles)
-            if scraped_articles and isinstance(scraped_articles, dict)
-            else scraped_articles
-        )
+        if scraped_articles is None:
+            scraped_articles = blog_scrape_cache.get(normalize_key(topic))
+            if scraped_articles is not None:
+                scraped_articles = unpack_scraped_articles(scraped_articles)
+                self.add_session_entry("scraped_articles", topic, pack_scraped_articles(scraped_articles))
+                return scraped_articles
+        if not scraped_articles:
+            return scraped_articles
+        return unpack_scraped_articles(scraped_articles)
 
     def add_scraped_articles_to_cache(self, topic: str, scraped_articles: Dict[str, ScrapedArticle]):
         logger.info(f"Saving scraped articles for topic: {topic}")
-        self.session_state.setdefault("scraped_articles", {})
-        self.session_state["scraped_articles"][topic] = scraped_articles
+        self.add_session_entry("scraped_articles", topic, pack_scraped_articles(scraped_articles))
+        blog_scrape_cache.set(
+            normalize_key(topic), {url: article.model_dump() for url, article in scraped_articles.items()}
+        )
 
     def get_search_results(self, topic: str, use_search_cache: bool, num_attempts: int = 3) -> Optional[SearchResults]:
         # Get cached search_results from the session state if use_search_cache is True
@@ -300,7 +456,6 @@ class BlogPostGenerator(Workflow):
                     elif isinstance(searcher_response.content, str):
                         # Try to parse JSON string response
                         try:
-                            import re
                             # Extract JSON from the response if it's embedded in text
                             json_match = re.search(r'\{.*\}', searcher_response.content, re.DOTALL)
                             if json_match:
@@ -332,6 +487,40 @@ class BlogPostGenerator(Workflow):
         logger.error(f"Failed to get search results after {num_attempts} attempts")
         return None
 
+    def scrape_article(self, article: NewsArticle) -> Optional[ScrapedArticle]:
+        """Scrape a single article. Returns None if the scraper gave no response."""
+        if self.direct_extraction:
+            scraped_article = extract_article(article)
+            if scraped_article is not None:
+                return scraped_article
+            logger.info(f"Direct extraction failed, using the article scraper for: {article.url}")
+
+        # Each call gets its own copy of the scraper, a shared Agent is not safe to run concurrently
+        article_scraper = self.article_scraper.deep_copy()
+        article_scraper_response: RunResponse = article_scraper.run(article.url)
+        if article_scraper_response is None or article_scraper_response.content is None:
+            return None
+
+        # Try to parse the response as ScrapedArticle
+        if isinstance(article_scraper_response.content, ScrapedArticle):
+            return article_scraper_response.content
+        elif isinstance(article_scraper_response.content, str):
+            # Try to parse JSON string response
+            try:
+                # Extract JSON from the response if it's embedded in text
+                json_match = re.search(r'\{.*\}', article_scraper_response.content, re.DOTALL)
+                if json_match:
+                    json_str = json_match.group()
+                    data = json.loads(json_str)
+                    return ScrapedArticle.model_validate(data)
+                # If no JSON found, create a simple response
+                logger.warning(f"No JSON found for article: {article.url}")
+            except (json.JSONDecodeError, Exception) as e:
+                logger.warning(f"Failed to parse scraped article JSON: {e}")
+        else:
+            logger.warning(f"Unexpected scraper response type: {type(article_scraper_response.content)}")
+        return ScrapedArticle(title=article.title, url=article.url, summary=article.summary, content=None)
+
     def scrape_articles(
         self, topic: str, search_results: SearchResults, use_scrape_cache: bool
     ) -> Dict[str, ScrapedArticle]:
@@ -348,53 +537,56 @@ class BlogPostGenerator(Workflow):
             except Exception as e:
                 logger.warning(f"Could not read scraped articles from cache: {e}")
 
-        # Scrape the articles that are not in the cache
+        # Scrape the articles that are not in the cache, at most scrape_max_workers at a time
+        articles_to_scrape: Dict[str, NewsArticle] = {}
         for article in search_results.articles:
             if article.url in scraped_articles:
                 logger.info(f"Found scraped article in cache: {article.url}")
                 continue
+            articles_to_scrape.setdefault(article.url, article)
+
+        started_at: Dict[str, float] = {}
+        results: Dict[str, Optional[ScrapedArticle]] = {}
 
-            article_scraper_response: RunResponse = self.article_scraper.run(article.url)
-            if article_scraper_response is not None and article_scraper_response.content is not None:
-                # Try to parse the response as ScrapedArticle
-                if isinstance(article_scraper_response.content, ScrapedArticle):
-                    scraped_article = article_scraper_response.content
-                elif isinstance(article_scraper_response.content, str):
-                    # Try to parse JSON string response
+        def scrape(article: NewsArticle) -> Optional[ScrapedArticle]:
+            started_at[article.url] = time.monotonic()
+            return self.scrape_article(article)
+
+        executor = ThreadPoolExecutor(max_workers=self.scrape_max_workers)
+        futures: Dict[Future, NewsArticle] = {
+            executor.submit(scrape, article): article for article in articles_to_scrape.values()
+        }
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    article = futures[future]
                     try:
-                        import re
-                        # Extract JSON from the response if it's embedded in text
-                        json_match = re.search(r'\{.*\}', article_scraper_response.content, re.DOTALL)
-                        if json_match:
-                            json_str = json_match.group()
-                            data = json.loads(json_str)
-                            scraped_article = ScrapedArticle.model_validate(data)
-                        else:
-                            # If no JSON found, create a simple response
-                            logger.warning(f"No JSON found for article: {article.url}")
-                            scraped_article = ScrapedArticle(
-                                title=article.title,
-                                url=article.url,
-                                summary=article.summary,
-                                content=None
-                            )
-                    except (json.JSONDecodeError, Exception) as e:
-                        logger.warning(f"Failed to parse scraped article JSON: {e}")
-                        scraped_article = ScrapedArticle(
-                            title=article.title,
-                            url=article.url,
-                            summary=article.summary,
-                            content=None
+                        results[article.url] = future.result()
+                    except Exception as e:
+                        logger.warning(f"Failed to scrape article {article.url}: {e}")
+                        results[article.url] = ScrapedArticle(
+                            title=article.title, url=article.url, summary=article.summary, content=None
                         )
-                else:
-                    logger.warning(f"Unexpected scraper response type: {type(article_scraper_response.content)}")
-                    scraped_article = ScrapedArticle(
-                        title=article.title,
-                        url=article.url,
-                        summary=article.summary,
-                        content=None
-                    )
-                
+
+                # Give up on articles that have been scraping for longer than scrape_timeout
+                now = time.monotonic()
+                for future in list(pending):
+                    article = futures[future]
+                    if article.url in started_at and now - started_at[article.url] > self.scrape_timeout:
+                        logger.warning(f"Timed out after {self.scrape_timeout}s scraping article: {article.url}")
+                        results[article.url] = ScrapedArticle(
+                            title=article.title, url=article.url, summary=article.summary, content=None
+                        )
+                        pending.discard(future)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        # Merge the results in search order
+        for url in articles_to_scrape:
+            scraped_article = results.get(url)
+            if scraped_article is not None:
                 scraped_articles[scraped_article.url] = scraped_article
                 logger.info(f"Scraped article: {scraped_article.url}")
 
@@ -422,7 +614,7 @@ def get_blog_post_generator(debug_mode: bool = False) -> BlogPostGenerator:
         workflow_id="generate-blog-post-on",
         storage=PostgresStorage(
             table_name="blog_post_generator_workflows",
-            db_url=db_url,
+            db_engine=db_engine,
             auto_upgrade_schema=True,
             mode="workflow",
         ),
@@ -1,21 +1,41 @@
 # Apply agno-ck metadata fix before any agno imports
 import agno_metadata_fix
 
+import re
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
 from textwrap import dedent
-from typing import Iterator
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 from agno.agent import Agent, RunResponse
 from agno.models.openai import OpenAIChat
-from agno.models.openrouter import OpenRouter
 from agno.storage.postgres import PostgresStorage
-from agno.tools.yfinance import YFinanceTools
 from agno.utils.log import logger
 from agno.workflow import Workflow
 
-from db.session import db_url
+from db.session import db_engine
+from models.openrouter import PooledOpenRouter
+from tools.market_data import CachedYFinanceTools
 from workflows.settings import workflow_settings
 
 
+# Upper-case tokens such as "AAPL", "BRK.B" or "BF-B"
+_TICKER = re.compile(r"^[A-Z.\-]{1,5}$")
+# Upper-case words that look like tickers in prose
+_NOT_TICKERS = frozenset("I A AND OR THE VS US USA UK EU AI CEO CFO ETF IPO EPS ESG GDP USD EUR".split())
+
+
+def parse_tickers(companies: str) -> List[str]:
+    """
+    Returns the tokens of companies that look like tickers, e.g. AAPL and NVDA in
+    "Compare AAPL and NVDA for a long-term investor", keeping the order.
+    Prose without upper-case tickers, such as "Apple and Microsoft", gives no tickers.
+    """
+    tokens = (token.strip(".,;:!?()$\"'") for token in re.split(r"[,\s/]+", companies))
+    tickers = [token for token in tokens if _TICKER.match(token) and token not in _NOT_TICKERS]
+    return list(dict.fromkeys(tickers))
+
+
 class InvestmentReportGenerator(Workflow):
     """Advanced workflow for generating professional investment analysis with strategic recommendations."""
 
@@ -27,10 +47,22 @@ class InvestmentReportGenerator(Workflow):
     actionable investment advice.
     """)
 
+    # Fetches the market data for every ticker before the stock analyst runs
+    market_data_tools: CachedYFinanceTools = CachedYFinanceTools(
+        company_info=True, analyst_recommendations=True, company_news=True
+    )
+    # Maximum number of market data requests running at the same time
+    market_data_max_workers: int = 16
+    # Run the stages as a pipeline: each company is analysed and evaluated as soon as its data arrives.
+    # See run_pipelined().
+    pipelined: bool = False
+    # Maximum number of companies analysed at the same time in pipelined mode
+    pipeline_max_workers: int = 8
+
     stock_analyst: Agent = Agent(
         name="Stock Analyst",
-        model=OpenRouter(id="moonshotai/kimi-k2:free"),
-        tools=[YFinanceTools(company_info=True, analyst_recommendations=True, company_news=True)],
+        model=PooledOpenRouter(id="moonshotai/kimi-k2:free"),
+        tools=[CachedYFinanceTools(company_info=True, analyst_recommendations=True, company_news=True)],
         description=dedent("""\
         You are MarketMaster-X, an elite Senior Investment Analyst at Goldman Sachs with expertise in:
 
@@ -66,7 +98,7 @@ class InvestmentReportGenerator(Workflow):
 
     research_analyst: Agent = Agent(
         name="Research Analyst",
-        model=OpenRouter(id="moonshotai/kimi-k2:free"),
+        model=PooledOpenRouter(id="moonshotai/kimi-k2:free"),
         description=dedent("""\
         You are ValuePro-X, an elite Senior Research Analyst at Goldman Sachs specializing in:
 
@@ -100,7 +132,7 @@ class InvestmentReportGenerator(Workflow):
 
     investment_lead: Agent = Agent(
         name="Investment Lead",
-        model=OpenRouter(id="moonshotai/kimi-k2:free"),
+        model=PooledOpenRouter(id="moonshotai/kimi-k2:free"),
         description=dedent("""\
         You are PortfolioSage-X, a distinguished Senior Investment Lead at Goldman Sachs expert in:
 
@@ -133,23 +165,173 @@ class InvestmentReportGenerator(Workflow):
         markdown=True,
     )
 
+    def get_market_data(self, tickers: List[str]) -> Dict[str, Dict[str, str]]:
+        """Fetch company info, analyst recommendations and news for every ticker concurrently."""
+        fetchers: Dict[str, Callable[[str], str]] = {
+            "company_info": self.market_data_tools.get_company_info,
+            "analyst_recommendations": self.market_data_tools.get_analyst_recommendations,
+            "company_news": self.market_data_tools.get_company_news,
+        }
+        market_data: Dict[str, Dict[str, str]] = {ticker: {} for ticker in tickers}
+        if not tickers:
+            return market_data
+
+        max_workers = max(1, min(self.market_data_max_workers, len(tickers) * len(fetchers)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                (ticker, data_type): executor.submit(fetch, ticker)
+                for ticker in tickers
+                for data_type, fetch in fetchers.items()
+            }
+            for (ticker, data_type), future in futures.items():
+                try:
+                    market_data[ticker][data_type] = future.result()
+                except Exception as e:
+                    logger.warning(f"Could not fetch {data_type} for {ticker}: {e}")
+                    market_data[ticker][data_type] = f"Error fetching {data_type} for {ticker}: {e}"
+        return market_data
+
+    def get_stock_analyst_input(self, companies: str) -> str:
+        """
+        Build the stock analyst message: the user's request plus pre-fetched market data for the tickers in it.
+        Without recognisable tickers the request is passed on as is, and the analyst fetches data with its tools.
+        """
+        tickers = parse_tickers(companies)
+        if not tickers:
+            return companies
+        logger.info(f"Fetching market data for: {', '.join(tickers)}")
+        return f"{companies}\n\n{self.format_market_data(self.get_market_data(tickers))}"
+
+    @staticmethod
+    def format_market_data(market_data: Dict[str, Dict[str, str]]) -> str:
+        sections = [f"Companies: {', '.join(market_data)}", "", "Market data for each company:"]
+        for ticker, data in market_data.items():
+            sections.append(f"\n## {ticker}")
+            for data_type, value in data.items():
+                sections.append(f"### {data_type}\n{value}")
+        sections.append("\nUse the market data above. Only call a tool if data for a company is missing.")
+        return "\n".join(sections)
+
+    def run_stage(self, title: str, agent: Agent, message: str) -> Iterator[RunResponse]:
+        """
+        Stream one stage of the report.
+
+        The stage starts with a RunResponse holding its markdown heading and ends with a RunResponse
+        holding the stage metrics. Both carry the agent_id and agent_name of the stage.
+        """
+        yield RunResponse(content=f"## {title}\n\n", agent_id=agent.agent_id, agent_name=agent.name)
+        yield from agent.run(message, stream=True)
+        yield RunResponse(
+            content="\n\n",
+            agent_id=agent.agent_id,
+            agent_name=agent.name,
+            metrics=agent.run_response.metrics if agent.run_response is not None else None,
+        )
+
+    @staticmethod
+    def get_stage_output(agent: Agent) -> Optional[str]:
+        """Returns the content an Agent streamed in its last run."""
+        if agent.run_response is None or not agent.run_response.content:
+            return None
+        return str(agent.run_response.content)
+
     def run(self, companies: str) -> Iterator[RunResponse]:  # type: ignore
         logger.info(f"Getting investment reports for companies: {companies}")
-        initial_report: RunResponse = self.stock_analyst.run(companies)
-        if initial_report is None or not initial_report.content:
+        if self.pipelined:
+            yield from self.run_pipelined(companies)
+        else:
+            yield from self.run_sequential(companies)
+
+    def run_sequential(self, companies: str) -> Iterator[RunResponse]:
+        yield from self.run_stage("Market Analysis", self.stock_analyst, self.get_stock_analyst_input(companies))
+        initial_report = self.get_stage_output(self.stock_analyst)
+        if initial_report is None:
             yield RunResponse(
                 content="Sorry, could not get the stock analyst report.",
             )
             return
 
         logger.info("Ranking companies based on investment potential.")
-        ranked_companies: RunResponse = self.research_analyst.run(initial_report.content)
-        if ranked_companies is None or not ranked_companies.content:
+        yield from self.run_stage("Investment Ranking", self.research_analyst, initial_report)
+        ranked_companies = self.get_stage_output(self.research_analyst)
+        if ranked_companies is None:
             yield RunResponse(content="Sorry, could not get the ranked companies.")
             return
 
         logger.info("Reviewing the research report and producing an investment proposal.")
-        yield from self.investment_lead.run(ranked_companies.content, stream=True)
+        yield from self.run_stage("Investment Proposal", self.investment_lead, ranked_companies)
+
+    def analyse_company(self, companies: str, ticker: str, sections: "Queue[Tuple[str, str, Optional[str]]]") -> None:
+        """Analyse and evaluate one company, putting (ticker, stage, content) on `sections` as each stage ends."""
+        try:
+            stock_analyst = self.stock_analyst.deep_copy()
+            analysis_response = stock_analyst.run(
+                f"{companies}\n\nAnalyse {ticker} only, the other companies are analysed separately.\n\n"
+                f"{self.format_market_data(self.get_market_data([ticker]))}"
+            )
+            analysis = analysis_response.content if analysis_response is not None else None
+        except Exception as e:
+            logger.warning(f"Stock analysis failed for {ticker}: {e}")
+            analysis = None
+        sections.put((ticker, "analysis", analysis))
+        if not analysis:
+            sections.put((ticker, "evaluation", None))
+            return
+
+        try:
+            research_analyst = self.research_analyst.deep_copy()
+            evaluation_response = research_analyst.run(
+                f"Evaluate the investment potential of {ticker} for a ranking of several companies. "
+                f"Give it a score from 1 to 10 with your rationale.\n\n{analysis}"
+            )
+            evaluation = evaluation_response.content if evaluation_response is not None else None
+        except Exception as e:
+            logger.warning(f"Investment evaluation failed for {ticker}: {e}")
+            evaluation = None
+        sections.put((ticker, "evaluation", evaluation))
+
+    def run_pipelined(self, companies: str) -> Iterator[RunResponse]:
+        """
+        Run the report as a pipeline instead of three sequential stages.
+
+        Every company gets its own stock analyst and research analyst run, so a company is evaluated
+        as soon as its own analysis is done. The investment lead then ranks the per-company
+        evaluations into the proposal. Sections are yielded as they complete.
+        Without recognisable tickers in companies, the report runs as sequential stages.
+        """
+        tickers = parse_tickers(companies)
+        if not tickers:
+            yield from self.run_sequential(companies)
+            return
+
+        sections: "Queue[Tuple[str, str, Optional[str]]]" = Queue()
+        evaluations: Dict[str, Optional[str]] = {}
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.pipeline_max_workers, len(tickers))))
+        try:
+            for ticker in tickers:
+                executor.submit(self.analyse_company, companies, ticker, sections)
+
+            while len(evaluations) < len(tickers):
+                ticker, stage, content = sections.get()
+                if stage == "evaluation":
+                    evaluations[ticker] = content
+                if content:
+                    title = "Market Analysis" if stage == "analysis" else "Investment Evaluation"
+                    yield RunResponse(content=f"## {title}: {ticker}\n\n{content}\n\n")
+        finally:
+            executor.shutdown(wait=False)
+
+        ranked_companies = [f"## {ticker}\n{evaluations[ticker]}" for ticker in tickers if evaluations[ticker]]
+        if not ranked_companies:
+            yield RunResponse(content="Sorry, could not get the ranked companies.")
+            return
+
+        logger.info("Ranking the evaluated companies and producing an investment proposal.")
+        lead_input = (
+            "Rank these companies by investment potential, then produce the investment proposal.\n\n"
+            + "\n\n".join(ranked_companies)
+        )
+        yield from self.run_stage("Investment Proposal", self.investment_lead, lead_input)
 
 
 def get_investment_report_generator(debug_mode: bool = False) -> InvestmentReportGenerator:
@@ -157,7 +339,7 @@ def get_investment_report_generator(debug_mode: bool = False) -> InvestmentRepor
         workflow_id="generate-investment-report",
         storage=PostgresStorage(
             table_name="investment_report_generator_workflows",
-            db_url=db_url,
+            db_engine=db_engine,
             auto_upgrade_schema=True,
             mode="workflow",
         ),
@@ -12,6 +12,13 @@ class WorkflowSettings(BaseSettings):
     default_max_completion_tokens: int = 16000
     default_temperature: float = 0
 
+    # Shared BlogPostGenerator caches, TTLs in seconds
+    blog_search_cache_ttl: int = 6 * 60 * 60
+    blog_scrape_cache_ttl: int = 24 * 60 * 60
+    blog_post_cache_ttl: int = 24 * 60 * 60
+    # Entries kept per cache before the least recently used are evicted
+    blog_cache_max_entries: int = 1000
+
 
 # Create an WorkflowSettings object
 workflow_settings = WorkflowSettings()